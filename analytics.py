@@ -0,0 +1,216 @@
+# Normalized analytics storage
+# user_data keeps skills and recommendations as str(list) blobs and scores as text. Every
+# analysis is also recorded in typed, indexed tables (analyses, skills, analysis_skills,
+# analysis_courses) so analytics queries use indexes instead of scanning and parsing blobs.
+#
+# New rows are recorded by a write-behind hook; existing rows are backfilled with:
+#   python analytics.py --chunk-size 1000
+
+import ast
+import sys
+import argparse
+import datetime
+from db import USER_DATA_COLUMNS, get_pool, init_schema
+
+ACTUAL = 'A'
+RECOMMENDED = 'R'
+TIMESTAMP_FORMAT = "%Y-%m-%d_%H:%M:%S"
+DB_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_SOURCE_COLUMNS = ['Timestamp', 'resume_score', 'Page_no', 'Predicted_Field', 'User_level',
+                   'Actual_skills', 'Recommended_skills', 'Recommended_courses']
+_SOURCE_FROM = "FROM user_data u LEFT JOIN analyses a ON a.user_data_id = u.ID"
+_SOURCE_SELECT = f"SELECT u.ID, {', '.join('u.' + c for c in _SOURCE_COLUMNS)} {_SOURCE_FROM}"
+_BACKFILL_SELECT = f"SELECT u.ID, a.ID, {', '.join('u.' + c for c in _SOURCE_COLUMNS)} {_SOURCE_FROM}"
+
+
+def _text(value):
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    return value
+
+
+def _int(value):
+    try:
+        return int(float(_text(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+def _list(value):
+    value = _text(value)
+    if not value:
+        return []
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return []
+    if isinstance(parsed, (list, tuple)):
+        return [str(item).strip() for item in parsed if str(item).strip()]
+    return []
+
+
+def _timestamp(value):
+    try:
+        return datetime.datetime.strptime(_text(value), TIMESTAMP_FORMAT).strftime(DB_TIMESTAMP_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def _db_time(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.strftime(DB_TIMESTAMP_FORMAT)
+    return value
+
+
+def _skill_ids(cursor, backend, names):
+    if not names:
+        return {}
+    cursor.executemany(backend.adapt(f"{backend.insert_ignore} INTO skills (name) VALUES (%s)"),
+                       [(name,) for name in names])
+    placeholders = ', '.join(['%s'] * len(names))
+    cursor.execute(backend.adapt(f"SELECT ID, name FROM skills WHERE name IN ({placeholders})"), list(names))
+    return {name: skill_id for skill_id, name in cursor.fetchall()}
+
+
+def record_rows(cursor, backend, rows):
+    # rows: (user_data ID, *_SOURCE_COLUMNS) not yet present in analyses
+    if not rows:
+        return 0
+    parsed = []
+    names = set()
+    for row in rows:
+        values = dict(zip(_SOURCE_COLUMNS, row[1:]))
+        actual = [s.lower() for s in _list(values['Actual_skills'])]
+        recommended = [s.lower() for s in _list(values['Recommended_skills'])]
+        names.update(actual)
+        names.update(recommended)
+        parsed.append((row[0], values, actual, recommended, _list(values['Recommended_courses'])))
+
+    skill_ids = _skill_ids(cursor, backend, sorted(names))
+    links = []
+    course_rows = []
+    insert_analysis = backend.adapt("INSERT INTO analyses (user_data_id, created_at, resume_score, page_no, "
+                                    "predicted_field, user_level) VALUES (%s, %s, %s, %s, %s, %s)")
+    for user_data_id, values, actual, recommended, courses in parsed:
+        cursor.execute(insert_analysis, (user_data_id, _timestamp(values['Timestamp']), _int(values['resume_score']),
+                                         _int(values['Page_no']), _text(values['Predicted_Field']),
+                                         _text(values['User_level'])))
+        analysis_id = cursor.lastrowid
+        for kind, skills in ((ACTUAL, actual), (RECOMMENDED, recommended)):
+            for skill_id in dict.fromkeys(skill_ids[s] for s in skills if s in skill_ids):
+                links.append((analysis_id, skill_id, kind))
+        course_rows.extend((analysis_id, position, course[:255]) for position, course in enumerate(courses))
+
+    if links:
+        cursor.executemany(backend.adapt("INSERT INTO analysis_skills (analysis_id, skill_id, kind) VALUES (%s, %s, %s)"), links)
+    if course_rows:
+        cursor.executemany(backend.adapt("INSERT INTO analysis_courses (analysis_id, position, course) VALUES (%s, %s, %s)"), course_rows)
+    return len(rows)
+
+
+def analytics_hook(pool):
+    token_position = USER_DATA_COLUMNS.index('sec_token')
+
+    def hook(conn, table, rows):
+        if table != 'user_data':
+            return
+        tokens = list(dict.fromkeys(row[token_position] for row in rows))
+        cursor = conn.cursor()
+        placeholders = ', '.join(['%s'] * len(tokens))
+        cursor.execute(pool.backend.adapt(f"{_SOURCE_SELECT} WHERE u.sec_token IN ({placeholders}) AND a.ID IS NULL"),
+                       tokens)
+        record_rows(cursor, pool.backend, cursor.fetchall())
+    return hook
+
+
+def install(pool, writer):
+    writer.add_hook(analytics_hook(pool))
+
+
+def backfill(pool, chunk_size=1000, progress=None):
+    # Walks user_data by ID in chunks, one transaction per chunk, skipping rows already recorded;
+    # safe to stop and re-run at any point
+    last_id = 0
+    total = 0
+    while True:
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(pool.backend.adapt(f"{_BACKFILL_SELECT} WHERE u.ID > %s ORDER BY u.ID LIMIT %s"),
+                           (last_id, chunk_size))
+            chunk = cursor.fetchall()
+            if not chunk:
+                break
+            last_id = chunk[-1][0]
+            pending = [(row[0],) + tuple(row[2:]) for row in chunk if row[1] is None]
+            total += record_rows(cursor, pool.backend, pending)
+            conn.commit()
+        if progress:
+            progress(last_id, total)
+    return total
+
+
+def _range_filter(since, until, column='a.created_at'):
+    clauses = []
+    params = []
+    if since is not None:
+        clauses.append(f"{column} >= %s")
+        params.append(_db_time(since))
+    if until is not None:
+        clauses.append(f"{column} < %s")
+        params.append(_db_time(until))
+    return clauses, params
+
+
+def top_skills(pool, since=None, until=None, limit=20, kind=ACTUAL, field=None):
+    clauses, params = _range_filter(since, until)
+    clauses.append("l.kind = %s")
+    params.append(kind)
+    if field is not None:
+        clauses.append("a.predicted_field = %s")
+        params.append(field)
+    sql = ("SELECT s.name, COUNT(*) AS n FROM analyses a "
+           "JOIN analysis_skills l ON l.analysis_id = a.ID "
+           "JOIN skills s ON s.ID = l.skill_id "
+           f"WHERE {' AND '.join(clauses)} GROUP BY s.name ORDER BY n DESC LIMIT %s")
+    return pool.fetchall(sql, params + [limit])
+
+
+def score_distribution(pool, since=None, until=None, field=None, bucket=10):
+    clauses, params = _range_filter(since, until)
+    clauses.append("a.resume_score IS NOT NULL")
+    if field is not None:
+        clauses.append("a.predicted_field = %s")
+        params.append(field)
+    # Scores are 0-100, so grouping by exact score returns at most 101 rows to bucket here
+    sql = f"SELECT a.resume_score, COUNT(*) FROM analyses a WHERE {' AND '.join(clauses)} GROUP BY a.resume_score"
+    buckets = {}
+    for score, count in pool.fetchall(sql, params):
+        start = score - score % bucket
+        buckets[start] = buckets.get(start, 0) + count
+    return sorted(buckets.items())
+
+
+def average_score_by_field(pool, since=None, until=None):
+    clauses, params = _range_filter(since, until)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = (f"SELECT a.predicted_field, AVG(a.resume_score), COUNT(*) FROM analyses a {where} "
+           "GROUP BY a.predicted_field ORDER BY COUNT(*) DESC")
+    return pool.fetchall(sql, params)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Backfill the normalized analytics tables from user_data.")
+    arg_parser.add_argument('--chunk-size', type=int, default=1000)
+    args = arg_parser.parse_args(argv)
+
+    pool = get_pool()
+    init_schema(pool)
+    total = backfill(pool, args.chunk_size,
+                     progress=lambda last_id, done: print(f"Migrated {done} rows (up to ID {last_id})"))
+    print(f"Done: {total} rows migrated")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,139 +1,142 @@
 # AI Resume Analyzer
 # Built with Streamlit for resume parsing, analysis, and recommendations
 
+# Heavy or page-specific libraries (pandas, plotly, streamlit_tags, bcrypt) are imported in
+# the functions that use them, and nothing here touches the network or the database: the
+# pool, workers and file server start on first use by a page that needs them
+
 import streamlit as st
-import pandas as pd
 import base64
 import time
 import datetime
-import pymysql
-import socket
-import platform
-import geocoder
 import secrets
-import io
+import hashlib
 import random
-import plotly.express as px
-from geopy.geocoders import Nominatim
-from streamlit_tags import st_tags
-from PIL import Image
-import nltk
-import bcrypt
 import os
-import getpass
-from resume_parser import ResumeParser  # Import custom parser
-from pdfminer3.pdfinterp import PDFResourceManager, PDFPageInterpreter
-from pdfminer3.converter import TextConverter
-from pdfminer3.layout import LAParams
-from pdfminer3.pdfpage import PDFPage
-
-nltk.download('stopwords')
-
-# Mock data for course recommendations
-ds_course = [("Data Science 101", "https://example.com/ds101"), ("ML Basics", "https://example.com/ml")]
-web_course = [("React JS", "https://example.com/react"), ("Django", "https://example.com/django")]
-android_course = [("Flutter", "https://example.com/flutter"), ("Kotlin", "https://example.com/kotlin")]
-ios_course = [("Swift", "https://example.com/swift"), ("Xcode", "https://example.com/xcode")]
-uiux_course = [("Figma", "https://example.com/figma"), ("Adobe XD", "https://example.com/adobexd")]
-resume_videos = ["https://www.youtube.com/watch?v=resume1"]
-interview_videos = ["https://www.youtube.com/watch?v=interview1"]
+import db
+import write_behind
+import dashboard
+import analytics
+import geolocation
+import file_server
+import exports
+import instrumentation
+import jobs
+from course_catalog import recommend_courses
+from courses import resume_videos, interview_videos
 
 # Utility Functions
-def get_csv_download_link(df, filename, text):
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    return f'<a href="data:file/csv;base64,{b64}" download="{filename}">{text}</a>'
+def course_recommender(catalog, missing_skills, seed):
+    st.subheader("**Courses & Certificates Recommendations**")
+    no_of_reco = st.slider('Choose Number of Course Recommendations:', 1, 10, 5)
+    rec_course = []
+    for c, course in enumerate(recommend_courses(catalog, missing_skills, no_of_reco, seed), 1):
+        st.markdown(f"({c}) [{course.name}]({course.link})")
+        rec_course.append(course.name)
+    return rec_course
 
-def pdf_reader(file_path):
+# Database Setup
+# Streamlit re-executes this script on every interaction; anything that must happen once per
+# server process (model loading, pool and writer creation, hook installation, schema setup)
+# lives in this singleton instead of at module level
+@st.experimental_singleton(show_spinner=False)
+def get_resources():
+    # Connections come from a bounded pool per operation; see db.py for backend settings
+    pool = db.get_pool()
+    db.init_schema(pool)
+    dashboard.ensure_summary(pool)
+    # Analysis and feedback rows are written in batches by a background thread
+    writer = write_behind.get_writer(pool)
+    dashboard.install(pool, writer)
+    analytics.install(pool, writer)
+    geolocation.get_locator()
+    return pool, writer
+
+@st.experimental_singleton(show_spinner=False)
+def get_file_server():
+    # Uploaded PDFs and exports are streamed by URL from a side port; see file_server.py
+    return file_server.get_file_server()
+
+@st.experimental_singleton(show_spinner=False)
+def get_job_queue():
+    # Resumes are parsed in worker processes that keep the spaCy models loaded; see jobs.py
+    return jobs.get_job_queue()
+
+def resources():
     try:
-        resource_manager = PDFResourceManager()
-        fake_file_handle = io.StringIO()
-        converter = TextConverter(resource_manager, fake_file_handle, laparams=LAParams())
-        page_interpreter = PDFPageInterpreter(resource_manager, converter)
-        with open(file_path, 'rb') as fh:
-            for page in PDFPage.get_pages(fh, caching=True, check_extractable=True):
-                page_interpreter.process_page(page)
-            text = fake_file_handle.getvalue()
-        converter.close()
-        fake_file_handle.close()
-        return text
+        return get_resources()
     except Exception as e:
-        st.error(f"Error reading PDF text: {str(e)}")
-        return None
+        st.error(f"Error initializing database: {str(e)}")
+        st.stop()
 
-def show_pdf(file_path):
+def analysis_jobs():
     try:
-        with open(file_path, "rb") as f:
-            base64_pdf = base64.b64encode(f.read()).decode('utf-8')
-        pdf_display = f'<iframe src="data:application/pdf;base64,{base64_pdf}" width="700" height="1000" type="application/pdf"></iframe>'
-        st.markdown(pdf_display, unsafe_allow_html=True)
+        return get_job_queue()
     except Exception as e:
-        st.error(f"Error displaying PDF: {str(e)}")
+        st.error(f"Error starting analysis workers: {str(e)}")
+        st.stop()
 
-def course_recommender(course_list):
-    st.subheader("**Courses & Certificates Recommendations**")
-    no_of_reco = st.slider('Choose Number of Course Recommendations:', 1, 10, 5)
-    random.shuffle(course_list)
-    rec_course = []
-    for c, (c_name, c_link) in enumerate(course_list, 1):
-        st.markdown(f"({c}) [{c_name}]({c_link})")
-        rec_course.append(c_name)
-        if c == no_of_reco:
-            break
-    return rec_course
+def file_links():
+    # None when the side port can't be bound, or when no RESUME_FILE_BASE_URL says where remote
+    # browsers can reach it; callers fall back to inline files. The server still runs for /metrics
+    try:
+        files = get_file_server()
+    except Exception as e:
+        print(f"Warning: {str(e)}; falling back to inline files")
+        return None
+    return files if files.linkable else None
 
-# Database Setup
-try:
-    connection = pymysql.connect(host='localhost', user='root', password='your_password', db='cv')
-    cursor = connection.cursor()
-except Exception as e:
-    st.error(f"Database connection failed: {str(e)}")
-    st.stop()
+def user_location():
+    # Waits briefly for this session's background lookup rather than storing a blank location
+    try:
+        return st.session_state.geo_future.result(timeout=GEO_WAIT)
+    except Exception as e:
+        print(f"Warning: Location lookup unavailable: {str(e)}")
+        return geolocation.UNKNOWN
+
+def queue_insert(table, insert_sql, params):
+    # When the queue is saturated, write synchronously instead of dropping the record
+    _, writer = resources()
+    if writer.submit(table, insert_sql, params):
+        instrumentation.count('resume_rows_submitted_total', table=table, path='queue')
+    else:
+        instrumentation.count('resume_rows_submitted_total', table=table, path='sync')
+        writer.write_now(table, insert_sql, params)
 
 def insert_data(sec_token, ip_add, host_name, dev_user, os_name_ver, latlong, city, state, country, 
                 act_name, act_mail, act_mob, name, email, res_score, timestamp, no_of_pages, 
                 reco_field, cand_level, skills, recommended_skills, courses, pdf_name):
     try:
-        insert_sql = """INSERT INTO user_data 
-                        (sec_token, ip_add, host_name, dev_user, os_name_ver, latlong, city, state, country, 
-                         act_name, act_mail, act_mob, Name, Email_ID, resume_score, Timestamp, Page_no, 
-                         Predicted_Field, User_level, Actual_skills, Recommended_skills, Recommended_courses, pdf_name) 
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-        cursor.execute(insert_sql, (sec_token, ip_add, host_name, dev_user, os_name_ver, str(latlong), city, state, country, 
-                                   act_name, act_mail, act_mob, name, email, res_score, timestamp, no_of_pages, 
-                                   reco_field, cand_level, skills, recommended_skills, courses, pdf_name))
-        connection.commit()
+        queue_insert('user_data', db.USER_DATA_INSERT, (sec_token, ip_add, host_name, dev_user, os_name_ver, str(latlong), city, state, country, 
+                                               act_name, act_mail, act_mob, name, email, res_score, timestamp, no_of_pages, 
+                                               reco_field, cand_level, skills, recommended_skills, courses, pdf_name))
     except Exception as e:
         st.error(f"Error inserting data: {str(e)}")
 
 def insertf_data(feed_name, feed_email, feed_score, comments, timestamp):
     try:
-        insert_sql = """INSERT INTO user_feedback 
-                        (feed_name, feed_email, feed_score, comments, Timestamp) 
-                        VALUES (%s, %s, %s, %s, %s)"""
-        cursor.execute(insert_sql, (feed_name, feed_email, feed_score, comments, timestamp))
-        connection.commit()
+        queue_insert('user_feedback', db.USER_FEEDBACK_INSERT, (feed_name, feed_email, feed_score, comments, timestamp))
     except Exception as e:
         st.error(f"Error inserting feedback: {str(e)}")
 
 def insert_student_user(username, password, name, email):
+    import bcrypt
     try:
         hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
         insert_sql = """INSERT INTO student_users (username, password, name, email) 
                         VALUES (%s, %s, %s, %s)"""
-        cursor.execute(insert_sql, (username, hashed_password, name, email))
-        connection.commit()
+        resources()[0].execute(insert_sql, (username, hashed_password, name, email))
         return True
-    except pymysql.err.IntegrityError:
+    except db.IntegrityError:
         return False  # Username already exists
     except Exception as e:
         st.error(f"Error registering user: {str(e)}")
         return False
 
 def verify_student_user(username, password):
+    import bcrypt
     try:
-        cursor.execute("SELECT password, name, email FROM student_users WHERE username = %s", (username,))
-        result = cursor.fetchone()
+        result = resources()[0].fetchone("SELECT password, name, email FROM student_users WHERE username = %s", (username,))
         if result:
             stored_password, name, email = result
             if bcrypt.checkpw(password.encode('utf-8'), stored_password.encode('utf-8')):
@@ -143,375 +146,444 @@ def verify_student_user(username, password):
         st.error(f"Error verifying user: {str(e)}")
         return False, None, None
 
+def show_table_page(table, columns, labels, key, limit=50):
+    # Keyset-paginated view of a table, newest rows first; only one page is ever fetched
+    import pandas as pd
+    page = st.session_state.get(key, {})
+    rows = dashboard.fetch_page(resources()[0], table, columns, after_id=page.get('after'), before_id=page.get('before'), limit=limit)
+    st.dataframe(pd.DataFrame(rows, columns=labels))
+    older, newer = st.columns(2)
+    if rows and older.button("Older", key=f"{key}_older"):
+        st.session_state[key] = {'before': rows[0][0]}
+        st.experimental_rerun()
+    if page and newer.button("Newer", key=f"{key}_newer"):
+        st.session_state[key] = {'after': rows[-1][0]} if rows else {}
+        st.experimental_rerun()
+
 # Streamlit Configuration
 st.set_page_config(page_title="AI Resume Analyzer", page_icon=":page_facing_up:")
 
-def run():
-    # Create Uploaded_Resumes directory if it doesn't exist
-    os.makedirs("./Uploaded_Resumes", exist_ok=True)
-
-    # UI Setup
-    img = Image.open('./Logo/RESUM1.png')
-    st.image(img, caption="Resume Analyzer Logo",width=600)
-    st.sidebar.markdown("# Navigation")
-    activities = ["User", "Feedback", "About", "Admin"]
-    choice = st.sidebar.selectbox("Select Option:", activities)
-    st.sidebar.markdown("Built by [Deepakragavan J](http://127.0.0.1:5500/portfolio.html)", unsafe_allow_html=True)
-
-    # Database Initialization
-    try:
-        cursor.execute("CREATE DATABASE IF NOT EXISTS cv")
-        cursor.execute("""CREATE TABLE IF NOT EXISTS user_data (
-            ID INT AUTO_INCREMENT PRIMARY KEY,
-            sec_token VARCHAR(20),
-            ip_add VARCHAR(50),
-            host_name VARCHAR(50),
-            dev_user VARCHAR(50),
-            os_name_ver VARCHAR(50),
-            latlong VARCHAR(50),
-            city VARCHAR(50),
-            state VARCHAR(50),
-            country VARCHAR(50),
-            act_name VARCHAR(50),
-            act_mail VARCHAR(50),
-            act_mob VARCHAR(20),
-            Name VARCHAR(500),
-            Email_ID VARCHAR(500),
-            resume_score VARCHAR(8),
-            Timestamp VARCHAR(50),
-            Page_no VARCHAR(5),
-            Predicted_Field BLOB,
-            User_level BLOB,
-            Actual_skills BLOB,
-            Recommended_skills BLOB,
-            Recommended_courses BLOB,
-            pdf_name VARCHAR(50)
-        )""")
-        cursor.execute("""CREATE TABLE IF NOT EXISTS user_feedback (
-            ID INT AUTO_INCREMENT PRIMARY KEY,
-            feed_name VARCHAR(50),
-            feed_email VARCHAR(50),
-            feed_score VARCHAR(5),
-            comments VARCHAR(100),
-            Timestamp VARCHAR(50)
-        )""")
-        cursor.execute("""CREATE TABLE IF NOT EXISTS student_users (
-            ID INT AUTO_INCREMENT PRIMARY KEY,
-            username VARCHAR(50) UNIQUE,
-            password VARCHAR(100),
-            name VARCHAR(50),
-            email VARCHAR(50)
-        )""")
-    except Exception as e:
-        st.error(f"Error initializing database: {str(e)}")
-        st.stop()
-
-    # User Section
-    if choice == "User":
-        st.markdown("### Student Login")
-        action = st.radio("Select Action:", ("Login", "Register"))
-
-        if action == "Register":
-            with st.form("register_form"):
-                st.write("Register New Student Account")
-                reg_username = st.text_input("Username*")
-                reg_password = st.text_input("Password*", type="password")
-                reg_name = st.text_input("Full Name*")
-                reg_email = st.text_input("Email*")
-                submitted = st.form_submit_button("Register")
-                if submitted:
-                    if reg_username and reg_password and reg_name and reg_email:
-                        if insert_student_user(reg_username, reg_password, reg_name, reg_email):
-                            st.success("Registration successful! Please login.")
-                        else:
-                            st.error("Username already exists.")
-                    else:
-                        st.error("All fields are required.")
-
-        elif action == "Login":
-            with st.form("login_form"):
-                st.write("Login to Your Account")
-                username = st.text_input("Username")
-                password = st.text_input("Password", type="password")
-                submitted = st.form_submit_button("Login")
-                if submitted:
-                    success, name, email = verify_student_user(username, password)
-                    if success:
-                        st.session_state.logged_in = True
-                        st.session_state.username = username
-                        st.session_state.name = name
-                        st.session_state.email = email
-                        st.success(f"Welcome, {name}!")
+MAX_SESSION_ANALYSES = 5
+POLL_INTERVAL = 0.5
+# Longest wait for the session's location lookup when an analysis is stored
+GEO_WAIT = geolocation.PUBLIC_IP_TIMEOUT + 2
+EXPORT_MAX_AGE = 24 * 3600
+# Without file links a report is held in memory to embed it in the page; larger ones need the file server
+EXPORT_INLINE_MAX_BYTES = int(os.environ.get('RESUME_EXPORT_INLINE_MAX_BYTES', str(50 * 1024 * 1024)))
+
+def pdf_iframe(src):
+    return f'<iframe src="{src}" width="700" height="1000" type="application/pdf"></iframe>'
+
+def show_pdf(analysis):
+    # The browser fetches the PDF itself (in ranges, with caching) from the file server. Signed
+    # links expire, so they are made on each run; signing is cheap
+    files = file_links()
+    if files is not None:
+        st.markdown(pdf_iframe(files.url('uploads', analysis['pdf_path'])), unsafe_allow_html=True)
+        return
+    # Inline fallback: the whole PDF goes into the page, so it waits until the analysis stops
+    # polling (twice a second) and is encoded once per upload
+    if analysis['status'] not in jobs.FINISHED:
+        st.caption("The resume preview appears when the analysis finishes.")
+        return
+    if analysis.get('pdf_html') is None:
+        with open(os.path.join(file_server.UPLOAD_DIR, analysis['pdf_path']), "rb") as f:
+            analysis['pdf_html'] = pdf_iframe(f"data:application/pdf;base64,{base64.b64encode(f.read()).decode('utf-8')}")
+    st.markdown(analysis['pdf_html'], unsafe_allow_html=True)
+
+def analyze_upload(pdf_file):
+    # Reruns triggered by widgets (sliders, skill tags, the mobile number field) reuse the
+    # analysis of the current upload from the session: the file is saved, encoded for
+    # display and submitted to the job queue once per distinct PDF
+    pdf_bytes = pdf_file.getvalue()
+    upload_hash = hashlib.sha256(pdf_bytes).hexdigest()
+    analyses = st.session_state.setdefault('analyses', {})
+    analysis = analyses.get(upload_hash)
+    if analysis is None:
+        # Stored under the content hash, so two uploads that share a file name never
+        # overwrite each other's preview
+        pdf_path = f"{upload_hash[:16]}/{os.path.basename(pdf_file.name)}"
+        save_path = os.path.join(file_server.UPLOAD_DIR, pdf_path)
+        if not os.path.exists(save_path):
+            os.makedirs(os.path.dirname(save_path), exist_ok=True)
+            with open(save_path, "wb") as f:
+                f.write(pdf_bytes)
+
+        # Raises jobs.QueueFull when the workers are saturated; nothing is stored, so the
+        # next rerun tries again
+        job_id = analysis_jobs().submit(pdf_bytes, name=pdf_file.name)
+        instrumentation.count('resume_uploads_total')
+        analysis = {
+            'upload_hash': upload_hash,
+            'pdf_name': pdf_file.name,
+            'pdf_path': pdf_path,
+            'pdf_html': None,
+            'job_id': job_id,
+            'job': None,
+            'status': jobs.QUEUED,
+            'error': None,
+            'resume_data': None,
+            'score': None,
+            'prediction': None,
+            # One token per analysis, so the record is identified the same way on every rerun
+            'sec_token': secrets.token_urlsafe(12),
+            'persisted': False,
+        }
+        while len(analyses) >= MAX_SESSION_ANALYSES:
+            del analyses[next(iter(analyses))]
+        analyses[upload_hash] = analysis
+
+    if analysis['status'] not in jobs.FINISHED:
+        job = analysis_jobs().status(analysis['job_id'])
+        if job is None:
+            analysis['status'] = jobs.FAILED
+            analysis['error'] = "Analysis job expired"
+        else:
+            analysis['job'] = job
+            analysis['status'] = job['status']
+            analysis['error'] = job['error']
+            if job['status'] in jobs.FINISHED:
+                instrumentation.log_event('analysis', job_id=job['id'], status=job['status'], error=job['error'],
+                                          seconds=round(job['finished'] - job['submitted'], 3))
+            if job['status'] == jobs.DONE:
+                analysis['resume_data'] = job['details']
+                analysis['score'] = job['score']
+                analysis['prediction'] = job['prediction']
+    return analysis
+
+def show_job_progress(analysis):
+    # Partial results are shown as the worker reports them; the page polls by rerunning
+    job = analysis['job'] or {}
+    stages = [job.get('text'), job.get('details'), job.get('score')]
+    if analysis['status'] == jobs.QUEUED:
+        st.info("Waiting for an analysis worker...")
+    else:
+        st.info("Analyzing resume...")
+    st.progress(int(100 * sum(1 for stage in stages if stage is not None) / (len(stages) + 1)))
+    if job.get('text'):
+        st.text(f"Text extracted: {job['text']['page_count'] or 'N/A'} page(s), {len(job['text']['text'])} characters")
+    if job.get('details'):
+        st.text(f"Name: {job['details'].get('name', 'N/A')}")
+        st.text(f"Email: {job['details'].get('email', 'N/A')}")
+        st.text(f"Skills found: {len(job['details'].get('skills') or [])}")
+    if job.get('score'):
+        st.text(f"Resume Score: {job['score']['score']}/100")
+    if st.button("Cancel analysis", key=f"cancel_{analysis['job_id']}"):
+        analysis_jobs().cancel(analysis['job_id'])
+    time.sleep(POLL_INTERVAL)
+    st.experimental_rerun()
+
+def user_page():
+    from streamlit_tags import st_tags
+    st.markdown("### Student Login")
+    action = st.radio("Select Action:", ("Login", "Register"))
+
+    if action == "Register":
+        with st.form("register_form"):
+            st.write("Register New Student Account")
+            reg_username = st.text_input("Username*")
+            reg_password = st.text_input("Password*", type="password")
+            reg_name = st.text_input("Full Name*")
+            reg_email = st.text_input("Email*")
+            submitted = st.form_submit_button("Register")
+            if submitted:
+                if reg_username and reg_password and reg_name and reg_email:
+                    if insert_student_user(reg_username, reg_password, reg_name, reg_email):
+                        st.success("Registration successful! Please login.")
                     else:
-                        st.error("Invalid username or password.")
-
-        if st.session_state.get("logged_in", False):
-            act_name = st.session_state.name
-            act_mail = st.session_state.email
-            act_mob = st.text_input("Mobile Number*")
-            sec_token = secrets.token_urlsafe(12)
-            host_name = socket.gethostname()
-            ip_add = socket.gethostbyname(host_name)
-            dev_user = getpass.getuser()
-            os_name_ver = f"{platform.system()} {platform.release()}"
-            g = geocoder.ip('me')
-            latlong = g.latlng
-            geolocator = Nominatim(user_agent="resume_analyzer")
-            location = geolocator.reverse(latlong, language='en') if latlong else None
-            address = location.raw['address'] if location else {}
-            city = address.get('city', '')
-            state = address.get('state', '')
-            country = address.get('country', '')
-
-            st.markdown("### Upload Your Resume")
-            pdf_file = st.file_uploader("Choose a PDF resume", type=["pdf"], key="resume_uploader")
-            if pdf_file:
-                try:
-                    with st.spinner("Analyzing resume..."):
-                        # Save uploaded file
-                        save_path = f"./Uploaded_Resumes/{pdf_file.name}"
-                        with open(save_path, "wb") as f:
-                            f.write(pdf_file.getbuffer())
-                        st.success("Resume uploaded successfully!")
-
-                        # Display PDF
-                        show_pdf(save_path)
-
-                        # Parse resume using custom ResumeParser
-                        resume_data = ResumeParser(pdf_file).get_extracted_data()
-                        resume_text = pdf_reader(save_path)
-
-                        if 'error' in resume_data:
-                            st.error(f"Resume parsing failed: {resume_data['error']}")
-                        elif resume_data and resume_text:
-                            st.header("Resume Analysis")
-                            st.success(f"Hello {resume_data.get('name', 'User')}")
-                            st.subheader("Basic Info")
-                            st.text(f"Name: {resume_data.get('name', 'N/A')}")
-                            st.text(f"Email: {resume_data.get('email', 'N/A')}")
-                            st.text(f"Contact: {resume_data.get('mobile_number', 'N/A')}")
-                            st.text(f"Degree: {resume_data.get('degree', 'N/A')}")
-                            st.text(f"Resume Pages: {resume_data.get('no_of_pages', 'N/A')}")
-
-                            # Experience Level
-                            cand_level = "Fresher"
-                            if resume_data.get('no_of_pages', 0) < 1:
-                                st.markdown("**Fresher Level**", unsafe_allow_html=True)
-                            elif resume_text and any(x in resume_text.upper() for x in ["INTERNSHIP", "INTERNSHIPS"]):
-                                cand_level = "Intermediate"
-                                st.markdown("**Intermediate Level**", unsafe_allow_html=True)
-                            elif resume_text and any(x in resume_text.upper() for x in ["EXPERIENCE", "WORK EXPERIENCE"]):
-                                cand_level = "Experienced"
-                                st.markdown("**Experienced Level**", unsafe_allow_html=True)
-
-                            # Skills Analysis
-                            st.subheader("Skills Recommendation")
-                            skills = resume_data.get('skills', [])
-                            keywords = st_tags(label="Current Skills", value=skills, key="skills")
-                            ds_keyword = ['tensorflow', 'keras', 'pytorch', 'machine learning', 'deep learning', 'flask', 'streamlit']
-                            web_keyword = ['react', 'django', 'node js', 'php', 'laravel', 'wordpress', 'javascript', 'flask']
-                            android_keyword = ['android', 'flutter', 'kotlin', 'xml']
-                            ios_keyword = ['ios', 'swift', 'cocoa', 'xcode']
-                            uiux_keyword = ['ux', 'adobe xd', 'figma', 'ui', 'prototyping', 'wireframes', 'photoshop']
-                            n_any = ['english', 'communication', 'microsoft office']
-
-                            recommended_skills = []
-                            reco_field = ""
-                            rec_course = ""
-                            for skill in skills:
-                                skill_lower = skill.lower()
-                                if skill_lower in ds_keyword:
-                                    reco_field = "Data Science"
-                                    recommended_skills = ['Data Visualization', 'Predictive Analysis', 'Data Mining', 'Scikit-learn', 'Tensorflow']
-                                    st.success("Looking for Data Science Jobs")
-                                    st_tags(label="Recommended Skills", value=recommended_skills, key="ds_skills")
-                                    rec_course = course_recommender(ds_course)
-                                    break
-                                elif skill_lower in web_keyword:
-                                    reco_field = "Web Development"
-                                    recommended_skills = ['React', 'Django', 'Node JS', 'PHP', 'Flask']
-                                    st.success("Looking for Web Development Jobs")
-                                    st_tags(label="Recommended Skills", value=recommended_skills, key="web_skills")
-                                    rec_course = course_recommender(web_course)
-                                    break
-                                elif skill_lower in android_keyword:
-                                    reco_field = "Android Development"
-                                    recommended_skills = ['Flutter', 'Kotlin', 'XML', 'Java', 'SQLite']
-                                    st.success("Looking for Android Development Jobs")
-                                    st_tags(label="Recommended Skills", value=recommended_skills, key="android_skills")
-                                    rec_course = course_recommender(android_course)
-                                    break
-                                elif skill_lower in ios_keyword:
-                                    reco_field = "IOS Development"
-                                    recommended_skills = ['Swift', 'Cocoa Touch', 'Xcode', 'Objective-C']
-                                    st.success("Looking for IOS Development Jobs")
-                                    st_tags(label="Recommended Skills", value=recommended_skills, key="ios_skills")
-                                    rec_course = course_recommender(ios_course)
-                                    break
-                                elif skill_lower in uiux_keyword:
-                                    reco_field = "UI-UX Development"
-                                    recommended_skills = ['Figma', 'Adobe XD', 'Prototyping', 'Wireframes']
-                                    st.success("Looking for UI-UX Development Jobs")
-                                    st_tags(label="Recommended Skills", value=recommended_skills, key="uiux_skills")
-                                    rec_course = course_recommender(uiux_course)
-                                    break
-                                elif skill_lower in n_any:
-                                    reco_field = "NA"
-                                    recommended_skills = ['No Recommendations']
-                                    st.warning("Only Data Science, Web, Android, IOS, and UI/UX supported")
-                                    st_tags(label="Recommended Skills", value=recommended_skills, key="na_skills")
-                                    rec_course = "Not Available"
-                                    break
-
-                            # Resume Scoring
-                            st.subheader("Resume Tips")
-                            resume_score = 0
-                            sections = [
-                                ("Objective or Summary", ["OBJECTIVE", "SUMMARY"], 6),
-                                ("Education", ["EDUCATION", "SCHOOL", "COLLEGE"], 12),
-                                ("Experience", ["EXPERIENCE", "WORK EXPERIENCE"], 16),
-                                ("Internships", ["INTERNSHIP", "INTERNSHIPS"], 6),
-                                ("Skills", ["SKILL", "SKILLS"], 7),
-                                ("Hobbies", ["HOBBIES"], 4),
-                                ("Interests", ["INTERESTS"], 5),
-                                ("Achievements", ["ACHIEVEMENTS"], 13),
-                                ("Certifications", ["CERTIFICATION", "CERTIFICATIONS"], 12),
-                                ("Projects", ["PROJECT", "PROJECTS"], 19)
-                            ]
-                            for section_name, keywords, score in sections:
-                                if resume_text and any(k in resume_text.upper() for k in keywords):
-                                    resume_score += score
-                                    st.markdown(f"[+] Added {section_name}", unsafe_allow_html=True)
-                                else:
-                                    st.markdown(f"[-] Add {section_name} to improve your resume", unsafe_allow_html=True)
-
-                            st.subheader("Resume Score")
-                            st.progress(resume_score)
-                            st.success(f"Your Resume Score: {resume_score}/100")
-                            st.warning("Score based on resume content")
-
-                            # Store Data
-                            timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
-                            insert_data(sec_token, ip_add, host_name, dev_user, os_name_ver, latlong, city, state, country, 
-                                        act_name, act_mail, act_mob, resume_data.get('name', 'N/A'), resume_data.get('email', 'N/A'), 
-                                        str(resume_score), timestamp, str(resume_data.get('no_of_pages', 'N/A')), 
-                                        reco_field, cand_level, str(skills), str(recommended_skills), 
-                                        str(rec_course), pdf_file.name)
-
-                            # Bonus Videos
-                            st.header("Resume Writing Tips")
-                            st.video(random.choice(resume_videos))
-                            st.header("Interview Tips")
-                            st.video(random.choice(interview_videos))
-                            st.balloons()
-                        else:
-                            st.error("Failed to parse resume. Please ensure the PDF is valid and contains extractable text.")
-                except Exception as e:
-                    st.error(f"Error processing resume: {str(e)}")
-            else:
-                st.info("Please upload a PDF resume to proceed.")
-
-    # Feedback Section
-    elif choice == "Feedback":
-        with st.form("feedback_form"):
-            st.write("Feedback Form")
-            feed_name = st.text_input("Name")
-            feed_email = st.text_input("Email")
-            feed_score = st.slider("Rate Us (1-5)", 1, 5)
-            comments = st.text_input("Comments")
-            submitted = st.form_submit_button("Submit")
+                        st.error("Username already exists.")
+                else:
+                    st.error("All fields are required.")
+
+    elif action == "Login":
+        with st.form("login_form"):
+            st.write("Login to Your Account")
+            username = st.text_input("Username")
+            password = st.text_input("Password", type="password")
+            submitted = st.form_submit_button("Login")
             if submitted:
-                timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
-                insertf_data(feed_name, feed_email, str(feed_score), comments, timestamp)
-                st.success("Feedback Submitted!")
-                st.balloons()
+                success, name, email = verify_student_user(username, password)
+                if success:
+                    st.session_state.logged_in = True
+                    st.session_state.username = username
+                    st.session_state.name = name
+                    st.session_state.email = email
+                    st.success(f"Welcome, {name}!")
+                else:
+                    st.error("Invalid username or password.")
+
+    if st.session_state.get("logged_in", False):
+        act_name = st.session_state.name
+        act_mail = st.session_state.email
+        act_mob = st.text_input("Mobile Number*")
+        host = geolocation.host_info()
+        host_name = host['host_name']
+        ip_add = host['ip_add']
+        dev_user = host['dev_user']
+        os_name_ver = host['os_name_ver']
+
+        # The location lookup runs in the background once per session; it is only needed when
+        # the analysis is stored, by which time it has normally finished
+        if "geo_future" not in st.session_state:
+            st.session_state.geo_future = geolocation.get_locator().locate_host_async()
+
+        st.markdown("### Upload Your Resume")
+        pdf_file = st.file_uploader("Choose a PDF resume", type=["pdf"], key="resume_uploader")
+        if pdf_file:
+            try:
+                analysis = analyze_upload(pdf_file)
+                st.success("Resume uploaded successfully!")
+
+                # Display PDF
+                show_pdf(analysis)
+
+                resume_data = analysis['resume_data']
+                if analysis['status'] not in jobs.FINISHED:
+                    show_job_progress(analysis)
+                elif analysis['status'] == jobs.CANCELLED:
+                    st.info("Analysis cancelled.")
+                    if st.button("Analyze again"):
+                        del st.session_state.analyses[analysis['upload_hash']]
+                        st.experimental_rerun()
+                elif analysis['status'] == jobs.FAILED:
+                    st.error(f"Resume parsing failed: {analysis['error']}")
+                elif resume_data and analysis['job']['text']['text']:
+                    st.header("Resume Analysis")
+                    st.success(f"Hello {resume_data.get('name', 'User')}")
+                    st.subheader("Basic Info")
+                    st.text(f"Name: {resume_data.get('name', 'N/A')}")
+                    st.text(f"Email: {resume_data.get('email', 'N/A')}")
+                    st.text(f"Contact: {resume_data.get('mobile_number', 'N/A')}")
+                    st.text(f"Degree: {resume_data.get('degree', 'N/A')}")
+                    st.text(f"Resume Pages: {resume_data.get('no_of_pages', 'N/A')}")
+
+                    # Section detection, score and experience level come from one scan of the text
+                    score_result = analysis['score']
+
+                    # Experience Level
+                    cand_level = score_result['level']
+                    if resume_data.get('no_of_pages', 0) < 1 or cand_level != "Fresher":
+                        st.markdown(f"**{cand_level} Level**", unsafe_allow_html=True)
+
+                    # Skills Analysis
+                    st.subheader("Skills Recommendation")
+                    skills = resume_data.get('skills', [])
+                    keywords = st_tags(label="Current Skills", value=skills, key="skills")
+
+                    # Field prediction ranks every skill against all fields from data/fields.json
+                    recommended_skills = []
+                    reco_field = ""
+                    rec_course = ""
+                    prediction = analysis['prediction']
+                    if prediction:
+                        reco_field = prediction['field']
+                        recommended_skills = prediction['recommended_skills']
+                        if prediction['supported']:
+                            st.success(f"Looking for {reco_field} Jobs")
+                        else:
+                            st.warning("Only Data Science, Web, Android, IOS, and UI/UX supported")
+                        st_tags(label="Recommended Skills", value=recommended_skills, key=f"{prediction['key']}_skills")
+                        if prediction['courses']:
+                            # Rank by the recommended skills the candidate is missing; the seed keeps
+                            # the list stable across reruns of the same upload
+                            have = {skill.lower() for skill in skills}
+                            missing = [skill for skill in recommended_skills if skill.lower() not in have]
+                            rec_course = course_recommender(prediction['courses'], missing, analysis['upload_hash'])
+                        else:
+                            rec_course = "Not Available"
+
+                    # Resume Scoring
+                    st.subheader("Resume Tips")
+                    resume_score = score_result['score']
+                    for section in score_result['sections']:
+                        if section['found']:
+                            st.markdown(f"[+] Added {section['section']}", unsafe_allow_html=True)
+                        else:
+                            st.markdown(f"[-] Add {section['section']} to improve your resume", unsafe_allow_html=True)
+
+                    st.subheader("Resume Score")
+                    st.progress(resume_score)
+                    st.success(f"Your Resume Score: {resume_score}/100")
+                    st.warning("Score based on resume content")
+                    if analysis['job']['text']['truncated']:
+                        st.warning(f"Only the first part of this {analysis['job']['text']['page_count']}-page resume "
+                                   f"was read, so the score and level may be too low")
+
+                    # Store Data once per analysis; later reruns only re-render
+                    first_view = not analysis['persisted']
+                    if first_view:
+                        timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
+                        location = user_location()
+                        insert_data(analysis['sec_token'], ip_add, host_name, dev_user, os_name_ver, location['latlong'],
+                                    location['city'], location['state'], location['country'],
+                                    act_name, act_mail, act_mob, resume_data.get('name', 'N/A'), resume_data.get('email', 'N/A'),
+                                    str(resume_score), timestamp, str(resume_data.get('no_of_pages', 'N/A')),
+                                    reco_field, cand_level, str(skills), str(recommended_skills),
+                                    str(rec_course), analysis['pdf_name'])
+                        analysis['persisted'] = True
+                        analysis['videos'] = (random.choice(resume_videos), random.choice(interview_videos))
+
+                    # Bonus Videos
+                    resume_video, interview_video = analysis['videos']
+                    st.header("Resume Writing Tips")
+                    st.video(resume_video)
+                    st.header("Interview Tips")
+                    st.video(interview_video)
+                    if first_view:
+                        st.balloons()
+                else:
+                    st.error("Failed to parse resume. Please ensure the PDF is valid and contains extractable text.")
+            except jobs.QueueFull as e:
+                st.warning(str(e))
+            except Exception as e:
+                st.error(f"Error processing resume: {str(e)}")
+        else:
+            st.info("Please upload a PDF resume to proceed.")
+
+def feedback_page():
+    import plotly.express as px
+    pool, _ = resources()
+    with st.form("feedback_form"):
+        st.write("Feedback Form")
+        feed_name = st.text_input("Name")
+        feed_email = st.text_input("Email")
+        feed_score = st.slider("Rate Us (1-5)", 1, 5)
+        comments = st.text_input("Comments")
+        submitted = st.form_submit_button("Submit")
+        if submitted:
+            timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
+            insertf_data(feed_name, feed_email, str(feed_score), comments, timestamp)
+            st.success("Feedback Submitted!")
+            st.balloons()
 
-        query = "SELECT * FROM user_feedback"
-        try:
-            feedback_data = pd.read_sql(query, connection)
-            st.subheader("User Ratings")
-            fig = px.pie(values=feedback_data['feed_score'].value_counts(), 
-                         names=feedback_data['feed_score'].unique(), 
+    try:
+        st.subheader("User Ratings")
+        ratings = dashboard.distribution(pool, 'user_feedback', 'feed_score')
+        if ratings:
+            fig = px.pie(values=[count for _, count in ratings],
+                         names=[value for value, _ in ratings],
                          title="User Rating Distribution")
             st.plotly_chart(fig)
 
-            st.subheader("User Comments")
-            st.dataframe(feedback_data[['feed_name', 'comments']], width=1000)
-        except Exception as e:
-            st.error(f"Error retrieving feedback: {str(e)}")
-
-    # About Section
-    elif choice == "About":
-        st.subheader("About AI Resume Analyzer")
-        st.markdown("""
-            This tool uses NLP to parse resumes, extract keywords, and provide tailored recommendations for skills and courses.
-            
-            **How to Use:**
-            - **User**: Register or login, then upload a PDF resume to get analysis and recommendations.
-            - **Feedback**: Share your thoughts about the tool.
-            - **Admin**: Login with username `admin` and password `admin123` to view analytics.
-            
-           
-        """, unsafe_allow_html=True)
-
-    # Admin Section
-    elif choice == "Admin":
-        st.success("Admin Dashboard")
-        ad_user = st.text_input("Username")
-        ad_password = st.text_input("Password", type="password")
-        if st.button("Login"):
-            if ad_user == "admin" and ad_password == "admin123":
-                try:
-                    # Fetch data for visualization
-                    cursor.execute("SELECT ID, ip_add, resume_score, Predicted_Field, User_level, city, state, country FROM user_data")
-                    data = cursor.fetchall()
-                    df = pd.DataFrame(data, columns=['ID', 'IP', 'Resume Score', 'Predicted Field', 'User Level', 'City', 'State', 'Country'])
-                    st.success(f"Total Users: {len(df)}")
-                    
-                    # Display full user data
-                    st.header("User Data")
-                    cursor.execute("SELECT * FROM user_data")
-                    user_data = cursor.fetchall()
-                    user_df = pd.DataFrame(user_data, columns=[
-                                'id', 'sec_token', 'ip_add', 'host_name', 'dev_user', 'os_name_ver', 'latlong',
-                                'city', 'state', 'country', 'act_name', 'act_mail', 'act_mobile', 'Name', 'Email_ID',
-                                'resume_score', 'Timestamp', 'Page_no', 'Predicted_Field', 'User_level',
-                                'Actual_skills', 'Recommended_skills', 'Recommended_courses', 'pdf_name'
-                            ])
-
-                    st.dataframe(user_df)
-                    st.markdown(get_csv_download_link(user_df, 'User_Data.csv', 'Download Report'), unsafe_allow_html=True)
-
-                    # Display feedback data
-                    st.header("Feedback Data")
-                    cursor.execute("SELECT * FROM user_feedback")
-                    feedback_data = cursor.fetchall()
-                    feedback_df = pd.DataFrame(feedback_data, columns=['ID', 'Name', 'Email', 'Score', 'Comments', 'Timestamp'])
-                    st.dataframe(feedback_df)
-
-                    # Visualization charts
-                    if not df.empty:
-                        for column, title in [
-                            ('Predicted Field', 'Predicted Field Distribution'),
-                            ('User Level', 'User Experience Levels'),
-                            ('Resume Score', 'Resume Scores'),
-                            ('IP', 'Usage by IP'),
-                            ('City', 'Usage by City'),
-                            ('State', 'Usage by State'),
-                            ('Country', 'Usage by Country')
-                        ]:
-                            if column in df.columns and not df[column].isna().all():
-                                st.subheader(f"**{title}**")
-                                fig = px.pie(values=df[column].value_counts(), names=df[column].unique(), title=title)
-                                st.plotly_chart(fig)
-                            else:
-                                st.warning(f"No data available for {title}")
+        st.subheader("User Comments")
+        show_table_page('user_feedback', ['feed_name', 'comments'], ['ID', 'feed_name', 'comments'], "comments_page")
+    except Exception as e:
+        st.error(f"Error retrieving feedback: {str(e)}")
+
+def about_page():
+    st.subheader("About AI Resume Analyzer")
+    st.markdown("""
+        This tool uses NLP to parse resumes, extract keywords, and provide tailored recommendations for skills and courses.
+
+        **How to Use:**
+        - **User**: Register or login, then upload a PDF resume to get analysis and recommendations.
+        - **Feedback**: Share your thoughts about the tool.
+        - **Admin**: Login with username `admin` and password `admin123` to view analytics.
+
+
+    """, unsafe_allow_html=True)
+
+def admin_page():
+    import plotly.express as px
+    st.success("Admin Dashboard")
+    ad_user = st.text_input("Username")
+    ad_password = st.text_input("Password", type="password")
+    if st.button("Login"):
+        st.session_state.admin_logged_in = ad_user == "admin" and ad_password == "admin123"
+        if not st.session_state.admin_logged_in:
+            st.error("Invalid Credentials")
+    # Remember the login so paging buttons don't log the admin out on rerun
+    if st.session_state.get("admin_logged_in", False):
+        pool, _ = resources()
+        files = file_links()
+        try:
+            total_users = dashboard.total_rows(pool, 'user_data')
+            st.success(f"Total Users: {total_users}")
+
+            # Display user data one page at a time
+            st.header("User Data")
+            user_columns = db.USER_DATA_COLUMNS
+            show_table_page('user_data', user_columns, ['id'] + user_columns, "user_data_page")
+            # Exports stream from the database to a file in chunks, whatever the table size
+            with st.expander("Export Report"):
+                export_format = st.selectbox("Format", exports.FORMATS, key="export_format")
+                export_columns = st.multiselect("Columns (all if empty)", exports.EXPORT_TABLES['user_data']['columns'],
+                                                key="export_columns")
+                export_range = st.date_input("Date range (optional)", value=[], key="export_range")
+                if st.button("Prepare Full Report"):
+                    since = datetime.datetime.combine(export_range[0], datetime.time()) if len(export_range) > 0 else None
+                    until = (datetime.datetime.combine(export_range[1], datetime.time()) + datetime.timedelta(days=1)
+                             if len(export_range) > 1 else None)
+                    export_name = f"User_Data_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+                    export_path = os.path.join(file_server.EXPORT_DIR, export_name)
+                    os.makedirs(file_server.EXPORT_DIR, exist_ok=True)
+                    try:
+                        if files is not None:
+                            files.prune('exports', EXPORT_MAX_AGE)
+                        with st.spinner("Exporting..."):
+                            total = exports.export(pool, export_path, export_format, 'user_data',
+                                                   export_columns or None, since, until)
+                        st.success(f"Exported {total} rows")
+                        if files is not None:
+                            # Downloaded from the file server instead of being embedded in the page
+                            download_url = files.url('exports', export_name, download=f"User_Data.{export_format}")
+                            st.markdown(f"[Download Report]({download_url})")
+                        elif os.path.getsize(export_path) > EXPORT_INLINE_MAX_BYTES:
+                            st.error("This report is too large to embed in the page. Set RESUME_FILE_BASE_URL to "
+                                     "download it from the file server, or narrow the columns or date range.")
+                        else:
+                            with open(export_path, "rb") as f:
+                                st.download_button("Download Report", f.read(), file_name=f"User_Data.{export_format}")
+                    except Exception as e:
+                        st.error(f"Error exporting report: {str(e)}")
+                    finally:
+                        # Without file links nothing downloads the file later, so it isn't kept
+                        if files is None and os.path.exists(export_path):
+                            os.remove(export_path)
+
+            # Display feedback data
+            st.header("Feedback Data")
+            show_table_page('user_feedback', db.USER_FEEDBACK_COLUMNS,
+                            ['ID', 'Name', 'Email', 'Score', 'Comments', 'Timestamp'], "feedback_page")
+
+            # Visualization charts from the pre-aggregated summary table
+            if total_users:
+                for column, title in [
+                    ('Predicted_Field', 'Predicted Field Distribution'),
+                    ('User_level', 'User Experience Levels'),
+                    ('resume_score', 'Resume Scores'),
+                    ('ip_add', 'Usage by IP'),
+                    ('city', 'Usage by City'),
+                    ('state', 'Usage by State'),
+                    ('country', 'Usage by Country')
+                ]:
+                    counts = dashboard.distribution(pool, 'user_data', column)
+                    if counts:
+                        st.subheader(f"**{title}**")
+                        fig = px.pie(values=[count for _, count in counts], names=[value for value, _ in counts], title=title)
+                        st.plotly_chart(fig)
                     else:
-                        st.warning("No user data available for visualization.")
-                except Exception as e:
-                    st.error(f"Error retrieving admin data: {str(e)}")
+                        st.warning(f"No data available for {title}")
             else:
-                st.error("Invalid Credentials")
+                st.warning("No user data available for visualization.")
+        except Exception as e:
+            st.error(f"Error retrieving admin data: {str(e)}")
+
+PAGES = {"User": user_page, "Feedback": feedback_page, "About": about_page, "Admin": admin_page}
+
+def run():
+    # Create Uploaded_Resumes directory if it doesn't exist
+    os.makedirs(file_server.UPLOAD_DIR, exist_ok=True)
+
+    # UI Setup
+    st.image('./Logo/RESUM1.png', caption="Resume Analyzer Logo",width=600)
+    st.sidebar.markdown("# Navigation")
+    activities = list(PAGES)
+    choice = st.sidebar.selectbox("Select Option:", activities)
+    st.sidebar.markdown("Built by [Deepakragavan J](http://127.0.0.1:5500/portfolio.html)", unsafe_allow_html=True)
+
+    # Each page loads only what it uses
+    PAGES[choice]()
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    run()
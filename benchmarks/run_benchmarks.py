@@ -0,0 +1,253 @@
+# Parser benchmark suite
+# Times each stage of resume analysis over the synthetic corpus (see synthetic_pdf.py):
+#   extract       pdfminer text extraction (utils.extract_text)
+#   pages         page count from the page tree (pdf_ingest)
+#   pages_pypdf2  utils.get_number_of_pages
+#   nlp           spaCy pipeline on the normalised text
+#   custom_nlp    custom NER model, when custom_nlp_model/ exists
+#   skills        skill index match
+#   contacts      contact scanner (emails, phones, links)
+#   degrees       degree and certification index match
+#   parse         ResumeParser end to end
+#   score         section scoring (score_resume)
+#   classify      field prediction
+# Cold numbers (model load, first parse) come from a fresh process. Reports p50/p95 per
+# stage, throughput and peak RSS, and compares them with a stored baseline.
+#
+# Usage:
+#   python benchmarks/run_benchmarks.py --save-baseline          # record benchmarks/baseline.json
+#   python benchmarks/run_benchmarks.py --threshold 0.25         # exit 1 on regressions
+
+import os
+import io
+import sys
+import json
+import math
+import time
+import resource
+import platform
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synthetic_pdf import generate_corpus, DEFAULT_SEED
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+STAGES = ['extract', 'pages', 'pages_pypdf2', 'nlp', 'custom_nlp', 'skills', 'contacts', 'degrees', 'parse', 'score', 'classify']
+# Stages faster than this are too noisy to fail a run on
+DEFAULT_MIN_MS = 1.0
+DEFAULT_THRESHOLD = 0.25
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(who).ru_maxrss / 1024.0
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(q / 100.0 * len(ordered)) - 1)]
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - started) * 1000.0, result
+
+
+def _cold_run(data):
+    # Runs in a fresh process: nothing imported or loaded yet
+    timings = {}
+    import_ms, _ = _timed(lambda: __import__('resume_parser'))
+    timings['import_ms'] = import_ms
+    import nlp_models
+    from resume_parser import ResumeParser
+    timings['model_load_ms'], _ = _timed(lambda: nlp_models.warm_up())
+    timings['first_parse_ms'], _ = _timed(lambda: ResumeParser(data).get_extracted_data())
+    timings['second_parse_ms'], _ = _timed(lambda: ResumeParser(data).get_extracted_data())
+    timings['peak_rss_mb'] = peak_rss_mb()
+    return timings
+
+
+def run_cold(data):
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(_cold_run, data).result()
+
+
+def run_warm(corpus, repeats):
+    import nlp_models
+    from pdf_ingest import load_document, PageStream
+    from resume_parser import ResumeParser, utils
+    from resume_scoring import score_resume
+    from field_classifier import predict_field
+    from skill_index import load_skill_index
+    from contact_scanner import get_scanner
+    from degree_matcher import load_degree_index
+
+    nlp_models.warm_up()
+    nlp = nlp_models.get_model()
+    custom_nlp = nlp_models.get_custom_model()
+    skill_index = load_skill_index()
+    scanner = get_scanner()
+    degree_index = load_degree_index()
+
+    def count_pages(data):
+        with PageStream(data) as stream:
+            return stream.count_remaining()
+
+    def one_pass(data):
+        timings = {}
+        timings['extract'], document = _timed(lambda: load_document(data))
+        timings['pages'], _ = _timed(lambda: count_pages(data))
+        timings['pages_pypdf2'], _ = _timed(lambda: utils.get_number_of_pages(io.BytesIO(data)))
+        timings['nlp'], _ = _timed(lambda: nlp(document.text))
+        if custom_nlp is not None:
+            timings['custom_nlp'], _ = _timed(lambda: custom_nlp(document.text_raw))
+        timings['skills'], matches = _timed(lambda: skill_index.match(document.text))
+        timings['contacts'], _ = _timed(lambda: scanner.scan(document.text))
+        timings['degrees'], _ = _timed(lambda: degree_index.match(document.text))
+        timings['parse'], _ = _timed(lambda: ResumeParser(data).get_extracted_data())
+        timings['score'], _ = _timed(lambda: score_resume(document.text_raw, page_count=document.page_count))
+        skills = list(dict.fromkeys(m.name for m in matches))
+        timings['classify'], _ = _timed(lambda: predict_field(skills))
+        return timings
+
+    # One untimed pass so lazy imports and first-call caches don't count as warm time
+    for _, data, _, _ in corpus[:1]:
+        one_pass(data)
+
+    samples = {stage: [] for stage in STAGES}
+    pages = 0
+    started = time.perf_counter()
+    for _ in range(repeats):
+        for _, data, page_count, _ in corpus:
+            for stage, ms in one_pass(data).items():
+                samples[stage].append(ms)
+            pages += page_count
+    elapsed = time.perf_counter() - started
+
+    stages = {}
+    for stage, values in samples.items():
+        if values:
+            stages[stage] = {'n': len(values), 'mean_ms': sum(values) / len(values),
+                             'p50_ms': percentile(values, 50), 'p95_ms': percentile(values, 95)}
+    parse_seconds = sum(samples['parse']) / 1000.0
+    throughput = {'docs_per_s': len(samples['parse']) / parse_seconds if parse_seconds else None,
+                  'pages_per_s': pages / (sum(samples['extract']) / 1000.0) if samples['extract'] else None,
+                  'wall_seconds': elapsed}
+    return stages, throughput
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD, min_ms=DEFAULT_MIN_MS):
+    # Returns [(metric, baseline value, current value, change)] for everything worse than threshold
+    regressions = []
+
+    def check(metric, base, value, higher_is_worse=True):
+        if base is None or value is None or base <= 0:
+            return
+        change = (value - base) / base if higher_is_worse else (base - value) / base
+        if change > threshold:
+            regressions.append((metric, base, value, change))
+
+    for stage, stats in current['stages'].items():
+        base = baseline.get('stages', {}).get(stage)
+        if not base:
+            continue
+        for key in ('p50_ms', 'p95_ms'):
+            if base[key] >= min_ms:
+                check(f"{stage}.{key}", base[key], stats[key])
+    for key, value in current.get('cold', {}).items():
+        base = baseline.get('cold', {}).get(key)
+        if key.endswith('_ms') and base is not None and base >= min_ms:
+            check(f"cold.{key}", base, value)
+    for key in ('docs_per_s', 'pages_per_s'):
+        check(f"throughput.{key}", baseline.get('throughput', {}).get(key), current['throughput'].get(key),
+              higher_is_worse=False)
+    for key, value in current.get('peak_rss_mb', {}).items():
+        check(f"peak_rss_mb.{key}", baseline.get('peak_rss_mb', {}).get(key), value)
+    return regressions
+
+
+def print_report(results, baseline=None):
+    print(f"{'stage':<14}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}{'base p50':>10}")
+    for stage in STAGES:
+        stats = results['stages'].get(stage)
+        if not stats:
+            continue
+        base = (baseline or {}).get('stages', {}).get(stage, {}).get('p50_ms')
+        base_text = f"{base:>10.2f}" if base is not None else f"{'-':>10}"
+        print(f"{stage:<14}{stats['n']:>6}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['mean_ms']:>10.2f}{base_text}")
+    for key, value in results.get('cold', {}).items():
+        print(f"cold {key}: {value:.1f}")
+    throughput = results['throughput']
+    if throughput['docs_per_s']:
+        print(f"throughput: {throughput['docs_per_s']:.1f} docs/s parsed, {throughput['pages_per_s']:.1f} pages/s extracted")
+    for key, value in results['peak_rss_mb'].items():
+        print(f"peak RSS ({key}): {value:.1f} MB")
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmark the resume parser stage by stage.")
+    arg_parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    arg_parser.add_argument('--per-combo', type=int, default=2, help="documents per (pages, skills) combination")
+    arg_parser.add_argument('--repeats', type=int, default=3, help="timed passes over the corpus")
+    arg_parser.add_argument('--skip-cold', action='store_true', help="don't measure a fresh process")
+    arg_parser.add_argument('--output', '-o', default=None, help="write the results as JSON")
+    arg_parser.add_argument('--baseline', default=BASELINE_FILE)
+    arg_parser.add_argument('--save-baseline', action='store_true', help="store these results as the baseline")
+    arg_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                            help="allowed slowdown before a metric counts as a regression (0.25 = 25%%)")
+    arg_parser.add_argument('--min-ms', type=float, default=DEFAULT_MIN_MS, help="ignore stages faster than this")
+    args = arg_parser.parse_args(argv)
+
+    corpus = generate_corpus(args.seed, per_combo=args.per_combo)
+    results = {
+        'meta': {'python': platform.python_version(), 'machine': platform.machine(), 'seed': args.seed,
+                 'documents': len(corpus), 'pages': sum(c[2] for c in corpus), 'repeats': args.repeats},
+        'cold': {},
+        'peak_rss_mb': {},
+    }
+    if not args.skip_cold:
+        cold = run_cold(corpus[0][1])
+        results['peak_rss_mb']['cold'] = cold.pop('peak_rss_mb')
+        results['cold'] = cold
+    results['stages'], results['throughput'] = run_warm(corpus, args.repeats)
+    results['peak_rss_mb']['warm'] = peak_rss_mb()
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if baseline is None:
+        print("No baseline to compare against; run with --save-baseline first")
+        return 0
+    if baseline.get('meta', {}).get('seed') != args.seed or baseline.get('meta', {}).get('documents') != len(corpus):
+        print("Warning: baseline was recorded with a different corpus; comparisons may not be meaningful")
+
+    regressions = compare(results, baseline, args.threshold, args.min_ms)
+    for metric, base, value, change in regressions:
+        print(f"REGRESSION {metric}: {base:.2f} -> {value:.2f} ({change:+.0%})")
+    if regressions:
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
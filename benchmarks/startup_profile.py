@@ -0,0 +1,180 @@
+# Startup profile
+# Imports the app module in a fresh interpreter with `python -X importtime`, the way a new
+# Streamlit server or a recycled worker does, and reports:
+#   - the wall time of the import (best of --repeats runs)
+#   - what each top-level import of the module costs (read from its source with ast)
+#   - the slowest modules overall
+#   - any network access attempted while importing (sockets are blocked in the child)
+# Exits 1 when the import exceeds the cold-start budget or touches the network, 2 when
+# the module can't be imported at all.
+#
+# Usage:
+#   python benchmarks/startup_profile.py                      # profile app.py
+#   python benchmarks/startup_profile.py --budget-ms 1500     # or RESUME_STARTUP_BUDGET_MS
+#   python benchmarks/startup_profile.py --module jobs        # any other module
+
+import os
+import re
+import ast
+import sys
+import json
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET_MS = float(os.environ.get('RESUME_STARTUP_BUDGET_MS', '2000'))
+RESULT_MARKER = 'STARTUP_PROFILE '
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$')
+
+# Runs in the child: refuse network connections, then time the import
+CHILD = r'''
+import sys, time, json, socket
+sys.path.insert(0, {root!r})
+attempts = []
+
+def _blocked(kind):
+    def refuse(*args, **kwargs):
+        attempts.append(f"{{kind}} {{args[1:3] if kind == 'connect' else args[:2]}}")
+        raise OSError("network access during import is not allowed")
+    return refuse
+
+_connect, _connect_ex = socket.socket.connect, socket.socket.connect_ex
+
+def _guard(original, kind):
+    def wrapper(self, *args, **kwargs):
+        if self.family in (socket.AF_INET, socket.AF_INET6):
+            return _blocked(kind)(self, *args, **kwargs)
+        return original(self, *args, **kwargs)
+    return wrapper
+
+socket.socket.connect = _guard(_connect, 'connect')
+socket.socket.connect_ex = _guard(_connect_ex, 'connect')
+socket.getaddrinfo = _blocked('getaddrinfo')
+socket.create_connection = _blocked('create_connection')
+
+error = None
+started = time.perf_counter()
+try:
+    __import__({module!r})
+except BaseException as e:
+    error = f"{{type(e).__name__}}: {{e}}"
+elapsed = (time.perf_counter() - started) * 1000.0
+print({marker!r} + json.dumps({{'ms': elapsed, 'network': attempts, 'error': error}}), flush=True)
+'''
+
+
+def top_level_imports(path):
+    # Modules imported at module level, in source order
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+    return list(dict.fromkeys(names))
+
+
+def parse_importtime(stderr):
+    # [(module, self_ms, cumulative_ms, depth)] in the order the interpreter printed them
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us) / 1000.0, int(cumulative_us) / 1000.0, (len(indent) - 1) // 2))
+    return entries
+
+
+def module_subtree(entries, module):
+    # importtime prints children before their parent, so the target's imports are the deeper
+    # lines right above it; modules the interpreter loaded at startup are left out
+    for i, (name, _, _, depth) in enumerate(entries):
+        if name == module and depth == 0:
+            start = i
+            while start > 0 and entries[start - 1][3] > 0:
+                start -= 1
+            return entries[start:i + 1]
+    return entries
+
+
+def profile_once(module):
+    code = CHILD.format(root=ROOT, module=module, marker=RESULT_MARKER)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, capture_output=True,
+                          text=True)
+    result = None
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            result = json.loads(line[len(RESULT_MARKER):])
+    if result is None:
+        raise Exception(f"Profiling {module} failed: {proc.stderr.strip()[-500:]}")
+    result['imports'] = module_subtree(parse_importtime(proc.stderr), module)
+    return result
+
+
+def profile(module, repeats=3):
+    # The first run also pays for a cold disk cache; the fastest run is the stable number
+    runs = [profile_once(module) for _ in range(max(1, repeats))]
+    best = min(runs, key=lambda r: r['ms'])
+    best['runs_ms'] = [r['ms'] for r in runs]
+    best['network'] = sorted({attempt for r in runs for attempt in r['network']})
+    return best
+
+
+def import_costs(result, names):
+    # Cumulative cost of each listed import; an import already pulled in by an earlier one is ~0
+    first_seen = {}
+    for name, _, cumulative, _ in result['imports']:
+        first_seen.setdefault(name, cumulative)
+    return [(name, first_seen.get(name, 0.0)) for name in names]
+
+
+def print_report(module, result, names, top, budget_ms):
+    print(f"import {module}: {result['ms']:.1f} ms (runs: {', '.join(f'{ms:.0f}' for ms in result['runs_ms'])} ms,"
+          f" budget {budget_ms:.0f} ms)")
+    if names:
+        print(f"\n{'top-level import of ' + module:<40}{'cumulative ms':>14}")
+        for name, ms in import_costs(result, names):
+            print(f"{name:<40}{ms:>14.1f}")
+    print(f"\n{'slowest modules':<40}{'self ms':>10}{'cumulative ms':>14}")
+    for name, self_ms, cumulative, _ in sorted(result['imports'], key=lambda e: -e[1])[:top]:
+        print(f"{name:<40}{self_ms:>10.1f}{cumulative:>14.1f}")
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Profile how long the app takes to import.")
+    arg_parser.add_argument('--module', default='app', help="module to import (default: app)")
+    arg_parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                            help="cold-start budget; default RESUME_STARTUP_BUDGET_MS or 2000")
+    arg_parser.add_argument('--repeats', type=int, default=3)
+    arg_parser.add_argument('--top', type=int, default=15, help="number of slowest modules to list")
+    arg_parser.add_argument('--output', '-o', default=None, help="write the profile as JSON")
+    args = arg_parser.parse_args(argv)
+
+    source = os.path.join(ROOT, args.module.replace('.', os.sep) + '.py')
+    names = top_level_imports(source) if os.path.exists(source) else []
+    result = profile(args.module, args.repeats)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'module': args.module, 'budget_ms': args.budget_ms, **result}, f, indent=2)
+
+    if result['error']:
+        print(f"Could not import {args.module}: {result['error']}")
+        return 2
+    print_report(args.module, result, names, args.top, args.budget_ms)
+
+    failed = False
+    for attempt in result['network']:
+        print(f"NETWORK at import time: {attempt}")
+        failed = True
+    if result['ms'] > args.budget_ms:
+        print(f"OVER BUDGET: {result['ms']:.1f} ms > {args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("Startup within budget, no network access")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
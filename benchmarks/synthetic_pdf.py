@@ -0,0 +1,175 @@
+# Synthetic resume corpus
+# Builds small, valid PDFs by hand (Helvetica text, no external tools) so the benchmark
+# corpus is deterministic and works offline. The same seed always yields the same bytes.
+#
+# Usage:
+#   python benchmarks/synthetic_pdf.py --output /tmp/corpus --seed 1013
+
+import os
+import sys
+import json
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIELDS_FILE = os.path.join(ROOT, 'data', 'fields.json')
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+MARGIN = 54
+FONT_SIZE = 10
+LEADING = 14
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LEADING
+LINE_CHARS = 95
+
+DEFAULT_SEED = 1013
+DEFAULT_PAGE_COUNTS = (1, 2, 3, 5)
+DEFAULT_SKILL_COUNTS = (5, 20, 60)
+
+FIRST_NAMES = ['Aarav', 'Priya', 'Rahul', 'Ananya', 'Vikram', 'Meera', 'Arjun', 'Kavya', 'Sanjay', 'Divya',
+               'Rohan', 'Sneha', 'Karthik', 'Lakshmi', 'Nikhil', 'Pooja']
+LAST_NAMES = ['Sharma', 'Iyer', 'Reddy', 'Nair', 'Gupta', 'Menon', 'Rao', 'Patel', 'Krishnan', 'Das']
+HEADINGS = ['OBJECTIVE', 'EDUCATION', 'EXPERIENCE', 'INTERNSHIPS', 'PROJECTS', 'SKILLS', 'CERTIFICATIONS',
+            'ACHIEVEMENTS', 'HOBBIES', 'INTERESTS']
+DEGREES = ['Bachelor of Technology in Computer Science', 'B.Tech Information Technology', 'MSc Data Science',
+           'Master of Computer Applications', 'BSc Mathematics', 'Diploma in Electronics']
+FILLER = ('designed built improved delivered maintained reviewed automated migrated documented tested deployed '
+          'analysed optimised the a new internal customer service team platform pipeline dashboard report '
+          'feature module system workflow process release quality performance latency throughput users '
+          'with for across using on in of to and by weekly daily across multiple stakeholders').split()
+
+
+def default_vocabulary():
+    # Skills the parser and field classifier actually know about
+    from skill_index import DEFAULT_SKILLS
+    skills = list(DEFAULT_SKILLS)
+    with open(FIELDS_FILE, 'r', encoding='utf-8') as f:
+        for field in json.load(f):
+            for keyword in field.get('keywords', []) + field.get('recommended_skills', []):
+                skills.append(keyword[0] if isinstance(keyword, (list, tuple)) else keyword)
+    return sorted({s.strip() for s in skills if s.strip()})
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def build_pdf(pages):
+    # pages: list of lists of text lines; returns the PDF bytes
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(None)
+    pages_id = add(None)
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    kids = []
+    for lines in pages:
+        ops = ["BT", f"/F1 {FONT_SIZE} Tf", f"{LEADING} TL", f"{MARGIN} {PAGE_HEIGHT - MARGIN} Td"]
+        ops.extend(f"({_escape(line)}) '" for line in lines)
+        ops.append("ET")
+        stream = "\n".join(ops).encode('latin-1', errors='replace')
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(add((f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                         f"/Resources << /Font << /F1 {font} 0 R >> >> /Contents {content} 0 R >>").encode()))
+    objects[catalog - 1] = f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode()
+    objects[pages_id - 1] = (f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] "
+                             f"/Count {len(kids)} >>").encode()
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(out)
+
+
+def _wrap(text):
+    lines = []
+    line = ''
+    for word in text.split():
+        if line and len(line) + len(word) + 1 > LINE_CHARS:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _sentence(rng, skills=()):
+    words = rng.sample(FILLER, rng.randint(8, 16))
+    for skill in skills:
+        words.insert(rng.randrange(len(words) + 1), skill)
+    return ' '.join(words).capitalize() + '.'
+
+
+def resume_lines(rng, page_count, skill_count, vocabulary):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    skills = rng.sample(vocabulary, min(skill_count, len(vocabulary)))
+    lines = [f"{first} {last}",
+             f"{first.lower()}.{last.lower()}{rng.randint(1, 99)}@example.com | +91 {rng.randint(70000, 99999)} "
+             f"{rng.randint(10000, 99999)}",
+             f"linkedin.com/in/{first.lower()}-{last.lower()}", ""]
+    headings = [h for h in HEADINGS if h in ('EDUCATION', 'SKILLS') or rng.random() < 0.7]
+    target = page_count * LINES_PER_PAGE
+    # Half the skills go in the skills section, the rest are mentioned in the body text
+    listed, mentioned = skills[:len(skills) // 2 + 1], skills[len(skills) // 2 + 1:]
+    while len(lines) < target:
+        for heading in headings:
+            if len(lines) >= target:
+                break
+            lines.extend([heading, ''])
+            if heading == 'EDUCATION':
+                lines.extend([f"{rng.choice(DEGREES)}, {rng.randint(2012, 2024)}", ''])
+            elif heading == 'SKILLS':
+                lines.extend(_wrap(', '.join(listed)) + [''])
+            else:
+                for _ in range(rng.randint(2, 5)):
+                    take = [mentioned.pop()] if mentioned and rng.random() < 0.6 else []
+                    lines.extend(_wrap(_sentence(rng, take)))
+                lines.append('')
+    lines = lines[:target]
+    return [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+
+
+def generate_corpus(seed=DEFAULT_SEED, page_counts=DEFAULT_PAGE_COUNTS, skill_counts=DEFAULT_SKILL_COUNTS,
+                    per_combo=2, vocabulary=None):
+    # Returns [(name, pdf bytes, page_count, skill_count), ...] in a fixed order
+    rng = random.Random(seed)
+    vocabulary = vocabulary or default_vocabulary()
+    corpus = []
+    for pages in page_counts:
+        for skill_count in skill_counts:
+            for i in range(per_combo):
+                data = build_pdf(resume_lines(rng, pages, skill_count, vocabulary))
+                corpus.append((f"resume_p{pages}_s{skill_count}_{i}.pdf", data, pages, skill_count))
+    return corpus
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Write the synthetic benchmark corpus to a directory.")
+    arg_parser.add_argument('--output', '-o', required=True)
+    arg_parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    arg_parser.add_argument('--per-combo', type=int, default=2, help="documents per (pages, skills) combination")
+    args = arg_parser.parse_args(argv)
+
+    os.makedirs(args.output, exist_ok=True)
+    corpus = generate_corpus(args.seed, per_combo=args.per_combo)
+    for name, data, _, _ in corpus:
+        with open(os.path.join(args.output, name), 'wb') as f:
+            f.write(data)
+    print(f"Wrote {len(corpus)} PDFs to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, ROOT)
+    sys.exit(main())
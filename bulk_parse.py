@@ -0,0 +1,234 @@
+# Bulk resume parsing
+# Text extraction runs in worker processes; spaCy runs in this process through nlp.pipe.
+#
+# Usage:
+#   python bulk_parse.py Uploaded_Resumes/ --output results.jsonl --workers 4 --batch-size 32
+
+import os
+import sys
+import json
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import nlp_models
+from functools import partial
+from pdf_ingest import ResumeDocument
+from resume_scoring import score_resume
+from field_classifier import load_field_classifier
+from resume_parser import ResumeParser, load_for_fields, resolve_fields, spacy_components, disabled_pipes, uses_custom_model
+
+# Per-resume summary keys; added by default, otherwise only when named in --fields
+SUMMARY_FIELDS = ('score', 'level', 'field')
+
+
+def collect_files(inputs):
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, names in os.walk(item):
+                for name in names:
+                    if name.lower().endswith('.pdf'):
+                        files.append(os.path.join(root, name))
+        else:
+            files.append(item)
+    return sorted(files)
+
+
+def split_fields(fields):
+    # --fields mixes parser fields and summary keys; None means the parser defaults plus every summary key
+    if fields is None:
+        return resolve_fields(None), SUMMARY_FIELDS
+    summary = tuple(f for f in SUMMARY_FIELDS if f in fields)
+    return resolve_fields([f for f in fields if f not in SUMMARY_FIELDS]), summary
+
+
+def _extract(path, fields, custom_regex, max_pages, max_chars, full_text):
+    # Runs in a worker process; returns plain data so it pickles cheaply
+    try:
+        document = load_for_fields(path, fields, custom_regex, max_pages, max_chars, full_text=full_text)
+        return path, (document.pages, document.page_count, document.truncated), None
+    except Exception as e:
+        return path, None, str(e)
+
+
+def _extract_all(files, workers, window, extract):
+    # Keep a bounded number of files in flight so huge archives don't queue every future up front.
+    # A worker that dies (e.g. crashes inside a PDF library) breaks the whole pool: the files in
+    # flight become error records and the rest continue in a fresh pool
+    remaining = deque(files)
+    while remaining:
+        failed = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            try:
+                while remaining or pending:
+                    while remaining and len(pending) < window:
+                        pending.append((remaining[0], executor.submit(extract, remaining[0])))
+                        remaining.popleft()
+                    result = pending[0][1].result()
+                    pending.popleft()
+                    yield result
+            except BrokenProcessPool as e:
+                failed = [path for path, _ in pending]
+                print(f"Warning: extraction worker died ({str(e)}); restarting the pool")
+        for path in failed:
+            yield path, None, "Text extraction worker died while this file was in flight"
+
+
+def _pipe(documents, fields):
+    # Runs the whole batch through the pipelines; raises if any document breaks them
+    docs = [None] * len(documents)
+    custom_docs = [None] * len(documents)
+    # Only run the pipelines (and components) the requested fields need
+    if spacy_components(fields):
+        nlp = nlp_models.get_model()
+        docs = list(nlp.pipe([d.text for d in documents], batch_size=len(documents),
+                             disable=disabled_pipes(nlp, fields)))
+    custom_nlp = nlp_models.get_custom_model() if uses_custom_model(fields) else None
+    if custom_nlp is not None:
+        custom_docs = list(custom_nlp.pipe([d.text_raw for d in documents], batch_size=len(documents)))
+    return docs, custom_docs
+
+
+def _summary(document, details, summary, classifier):
+    # A score from a cut-short document would look real but cover only part of the resume
+    record = {}
+    if 'score' in summary or 'level' in summary:
+        score = None if document.truncated else score_resume(document.text_raw, page_count=document.page_count)
+        if 'score' in summary:
+            record['score'] = score['score'] if score else None
+        if 'level' in summary:
+            record['level'] = score['level'] if score else None
+    if 'field' in summary:
+        # The field is predicted from the skills, so it needs the skills field and the whole text
+        prediction = None
+        if not document.truncated and 'skills' in details:
+            prediction = classifier.predict(details['skills'] or [])
+        record['field'] = prediction['field'] if prediction else None
+    return record
+
+
+def _parse_batch(batch, skills_file, custom_regex, fields, summary):
+    classifier = load_field_classifier() if 'field' in summary else None
+    documents = [document for _, document in batch]
+    try:
+        docs, custom_docs = _pipe(documents, fields)
+    except Exception as e:
+        # Parse the batch one document at a time so only the bad one fails
+        print(f"Warning: nlp.pipe failed on a batch of {len(batch)} ({str(e)}); parsing them one by one")
+        docs = custom_docs = [None] * len(documents)
+
+    for (path, document), doc, custom_doc in zip(batch, docs, custom_docs):
+        try:
+            parser = ResumeParser(document, skills_file=skills_file, custom_regex=custom_regex,
+                                  doc=doc, custom_doc=custom_doc, fields=fields)
+            details = parser.get_extracted_data()
+            yield {'file': path, 'details': details, **_summary(document, details, summary, classifier), 'error': None}
+        except Exception as e:
+            yield {'file': path, 'details': None, 'error': str(e)}
+
+
+def parse_files(files, workers=None, batch_size=32, skills_file=None, custom_regex=None, fields=None,
+                max_pages=None, max_chars=None):
+    workers = workers or os.cpu_count() or 1
+    fields, summary = split_fields(fields)
+    # Scores and fields need the whole text, so no early stop once the contact details are found
+    extract = partial(_extract, fields=fields, custom_regex=custom_regex, max_pages=max_pages, max_chars=max_chars,
+                      full_text=bool(summary))
+    batch = []
+    for path, extracted, error in _extract_all(files, workers, max(workers * 2, batch_size), extract):
+        if error is not None:
+            yield {'file': path, 'details': None, 'error': f"Failed to extract text from resume: {error}"}
+            continue
+        pages, page_count, truncated = extracted
+        batch.append((path, ResumeDocument(pages, name=os.path.basename(path), page_count=page_count, truncated=truncated)))
+        if len(batch) >= batch_size:
+            yield from _parse_batch(batch, skills_file, custom_regex, fields, summary)
+            batch = []
+    if batch:
+        yield from _parse_batch(batch, skills_file, custom_regex, fields, summary)
+
+
+def completed_files(output, retry_errors=False):
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A run killed mid-write can leave a truncated last line
+                continue
+            if retry_errors and record.get('error'):
+                continue
+            done.add(record['file'])
+    return done
+
+
+def drop_errors(output, files):
+    # Error records for these files are superseded by a retry or a later success; rewrite the
+    # output without them (and without any half-written line) so each file keeps one record
+    tmp = output + '.tmp'
+    with open(output, 'r', encoding='utf-8') as src, open(tmp, 'w', encoding='utf-8') as dst:
+        for line in src:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('error') and record['file'] in files:
+                continue
+            dst.write(line if line.endswith('\n') else line + '\n')
+    os.replace(tmp, output)
+
+
+def run_bulk(inputs, output, workers=None, batch_size=32, skills_file=None, custom_regex=None,
+             resume=True, retry_errors=False, fields=None, max_pages=None, max_chars=None):
+    files = collect_files(inputs)
+    total = len(files)
+    if resume:
+        done = completed_files(output, retry_errors)
+        files = [path for path in files if path not in done]
+        if retry_errors and os.path.exists(output):
+            drop_errors(output, done | set(files))
+
+    counts = {'parsed': 0, 'errors': 0, 'skipped': total - len(files)}
+    if not files:
+        return counts
+
+    with open(output, 'a' if resume else 'w', encoding='utf-8') as out:
+        for record in parse_files(files, workers, batch_size, skills_file, custom_regex, fields, max_pages, max_chars):
+            out.write(json.dumps(record) + '\n')
+            # Flush per record so an interrupted run can pick up where it stopped
+            out.flush()
+            counts['errors' if record['error'] else 'parsed'] += 1
+    return counts
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Parse many PDF resumes into a JSONL file.")
+    arg_parser.add_argument('inputs', nargs='+', help="PDF files or directories to scan for PDFs")
+    arg_parser.add_argument('--output', '-o', default='resumes.jsonl')
+    arg_parser.add_argument('--workers', '-w', type=int, default=None, help="text extraction processes (default: CPU count)")
+    arg_parser.add_argument('--batch-size', '-b', type=int, default=32, help="documents per nlp.pipe batch")
+    arg_parser.add_argument('--skills-file', default=None)
+    arg_parser.add_argument('--fields', default=None,
+                            help="comma-separated subset of: name,email,mobile_number,skills,degree,no_of_pages,"
+                                 "links,certifications,score,level,field")
+    arg_parser.add_argument('--max-pages', type=int, default=None, help="only extract text from the first N pages")
+    arg_parser.add_argument('--max-chars', type=int, default=None, help="cap the text passed to the NLP stage")
+    arg_parser.add_argument('--no-resume', action='store_true', help="overwrite the output instead of continuing it")
+    arg_parser.add_argument('--retry-errors', action='store_true', help="re-parse files that failed in a previous run")
+    args = arg_parser.parse_args(argv)
+    fields = [f.strip() for f in args.fields.split(',') if f.strip()] if args.fields else None
+
+    counts = run_bulk(args.inputs, args.output, workers=args.workers, batch_size=args.batch_size,
+                      skills_file=args.skills_file, resume=not args.no_resume, retry_errors=args.retry_errors,
+                      fields=fields, max_pages=args.max_pages, max_chars=args.max_chars)
+    print(f"Parsed {counts['parsed']}, errors {counts['errors']}, skipped {counts['skipped']} -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
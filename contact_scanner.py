@@ -0,0 +1,128 @@
+# Contact details scanner
+# Emails, phone numbers and profile links (LinkedIn, GitHub, any other web address counts as
+# a portfolio) are found by one compiled pattern in a single pass over the text. Matches keep
+# their character positions. Phone numbers are normalised to digits, keeping the country
+# code as "+<code>" when one was written. first_only=True stops the pass as soon as every
+# requested kind has been seen once.
+#
+# A custom phone regex replaces the built-in phone pattern; scanners are compiled once per
+# regex and reused.
+
+import re
+import threading
+from collections import namedtuple
+
+KINDS = ('email', 'phone', 'linkedin', 'github', 'portfolio')
+
+ContactMatch = namedtuple('ContactMatch', ['kind', 'value', 'start', 'end'])
+
+EMAIL_PATTERN = r"(?<![\w.%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"
+
+# Explicit web addresses, plus bare hosts that are almost always profile or portfolio links
+_URL_CHARS = r"[^\s<>\"'()\[\]{},;|]"
+LINK_PATTERN = (rf"(?<![\w@./-])(?:(?:https?://|www\.){_URL_CHARS}+"
+                rf"|(?:[a-z0-9-]+\.)*(?:linkedin\.com|github\.com|github\.io|gitlab\.com|netlify\.app|vercel\.app"
+                rf"|pages\.dev)(?:/{_URL_CHARS}*)?)")
+
+# Optional country code, then a 10 digit number written whole or in the usual groupings:
+# 9876543210, 98765 43210, 987-654-3210, (987) 654-3210, 20 7946 0958
+PHONE_PATTERN = (r"(?<![\w+])(?:\+\d{1,3}[\s.-]?)?"
+                 r"(?:\(\d{3}\)[\s.-]?\d{3}[\s.-]?\d{4}|\d{3}[\s.-]\d{3}[\s.-]\d{4}|\d{5}[\s.-]\d{5}"
+                 r"|\d{4}[\s.-]\d{3}[\s.-]\d{3}|\d{2,4}[\s.-]\d{3,4}[\s.-]\d{4}|0?\d{10})(?!\w)")
+
+_TRAILING = '.:!?-_'
+
+
+def normalize_phone(raw, strict=True):
+    # "+91 98765-43210" -> "+919876543210"; None when it isn't a plausible phone number
+    digits = re.sub(r'\D', '', raw)
+    if raw.lstrip().startswith('+'):
+        if strict and not 8 <= len(digits) <= 15:
+            return None
+        return '+' + digits
+    if strict and not (len(digits) == 10 or (len(digits) == 11 and digits.startswith('0'))):
+        return None
+    return digits or None
+
+
+def classify_link(raw):
+    # Returns (kind, normalised URL)
+    url = raw.rstrip(_TRAILING)
+    scheme, sep, rest = url.partition('://')
+    if not sep:
+        scheme, rest = 'https', url
+    host, slash, path = rest.partition('/')
+    host = host.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    path = (slash + path).rstrip('/')
+    if host == 'linkedin.com' or host.endswith('.linkedin.com'):
+        kind = 'linkedin'
+    elif host == 'github.com':
+        kind = 'github'
+    else:
+        kind = 'portfolio'
+    return kind, f"{scheme.lower()}://{host}{path}"
+
+
+class ContactScanner:
+    def __init__(self, custom_regex=None):
+        self.custom_regex = custom_regex
+        phone = f"(?:{custom_regex})" if custom_regex else PHONE_PATTERN
+        try:
+            self._pattern = re.compile(f"(?P<email>{EMAIL_PATTERN})|(?P<link>{LINK_PATTERN})|(?P<phone>{phone})",
+                                       re.IGNORECASE)
+        except re.error as e:
+            raise Exception(f"Invalid custom phone regex {custom_regex!r}: {str(e)}")
+
+    def scan(self, text, kinds=KINDS, first_only=False):
+        # Every match in text order; with first_only, at most one per kind
+        wanted = set(kinds)
+        matches = []
+        for m in self._pattern.finditer(text):
+            group = m.lastgroup
+            raw = m.group(group)
+            if group == 'email':
+                kind, value = 'email', raw
+            elif group == 'link':
+                # Sentence punctuation after a bare link isn't part of it
+                raw = raw.rstrip(_TRAILING)
+                kind, value = classify_link(raw)
+            else:
+                # A custom regex decides for itself what counts as a phone number
+                kind, value = 'phone', normalize_phone(raw, strict=not self.custom_regex)
+            if kind not in wanted or value is None:
+                continue
+            start = m.start(group)
+            matches.append(ContactMatch(kind, value, start, start + len(raw)))
+            if first_only:
+                wanted.discard(kind)
+                if not wanted:
+                    break
+        return matches
+
+    def first(self, text, kind):
+        matches = self.scan(text, (kind,), first_only=True)
+        return matches[0].value if matches else None
+
+    def links(self, text):
+        # {'linkedin': [...], 'github': [...], 'portfolio': [...]}, duplicates removed
+        links = {'linkedin': [], 'github': [], 'portfolio': []}
+        for match in self.scan(text, tuple(links)):
+            if match.value not in links[match.kind]:
+                links[match.kind].append(match.value)
+        return links
+
+
+_scanners = {}
+_lock = threading.Lock()
+
+
+def get_scanner(custom_regex=None):
+    scanner = _scanners.get(custom_regex)
+    if scanner is None:
+        with _lock:
+            scanner = _scanners.get(custom_regex)
+            if scanner is None:
+                scanner = _scanners[custom_regex] = ContactScanner(custom_regex)
+    return scanner
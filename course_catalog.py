@@ -0,0 +1,98 @@
+# Course catalog index
+# Built once from courses.py (or a JSON file shaped like {"ds_course": [[name, link], ...]}),
+# keyed by catalog name and by the skills each course title covers. Recommendations are
+# lookups plus seeded sampling; the shared course lists are never shuffled in place.
+
+import os
+import json
+import random
+import threading
+from collections import namedtuple
+import courses
+from skill_index import SkillIndex
+from field_classifier import FIELDS_FILE
+
+Course = namedtuple('Course', ['name', 'link', 'skills'])
+
+CATALOG_NAMES = ['ds_course', 'web_course', 'android_course', 'ios_course', 'uiux_course']
+
+
+def _skill_vocabulary(fields_file):
+    with open(fields_file, 'r', encoding='utf-8') as f:
+        fields = json.load(f)
+    vocabulary = []
+    for field in fields:
+        for keyword in field.get('keywords', []):
+            vocabulary.append(keyword[0] if isinstance(keyword, (list, tuple)) else keyword)
+        vocabulary.extend(field.get('recommended_skills', []))
+    return list(dict.fromkeys(v.lower() for v in vocabulary))
+
+
+class CourseCatalog:
+    def __init__(self, catalogs, skill_vocabulary=()):
+        tagger = SkillIndex.from_lines(skill_vocabulary)
+        self._by_catalog = {}
+        self._by_skill = {}
+        for catalog, entries in catalogs.items():
+            seen = set()
+            items = []
+            for name, link in entries:
+                if (name, link) in seen:
+                    continue
+                seen.add((name, link))
+                items.append(Course(name, link, tuple(tagger.extract(name))))
+            self._by_catalog[catalog] = tuple(items)
+            for position, course in enumerate(items):
+                for skill in course.skills:
+                    self._by_skill.setdefault((catalog, skill), []).append(position)
+
+    @classmethod
+    def from_courses_module(cls, fields_file=FIELDS_FILE):
+        catalogs = {name: getattr(courses, name) for name in CATALOG_NAMES if hasattr(courses, name)}
+        return cls(catalogs, _skill_vocabulary(fields_file))
+
+    @classmethod
+    def from_file(cls, path, fields_file=FIELDS_FILE):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), _skill_vocabulary(fields_file))
+
+    def courses(self, catalog):
+        return self._by_catalog.get(catalog, ())
+
+    def recommend(self, catalog, missing_skills=(), k=5, seed=None):
+        items = self._by_catalog.get(catalog, ())
+        if not items or k <= 0:
+            return []
+        rng = random.Random(seed)
+
+        # Courses covering more of the missing skills come first
+        coverage = {}
+        for skill in dict.fromkeys(s.lower() for s in missing_skills):
+            for position in self._by_skill.get((catalog, skill), ()):
+                coverage[position] = coverage.get(position, 0) + 1
+        ranked = sorted(coverage, key=lambda p: (-coverage[p], rng.random()))[:k]
+
+        # Fill the remaining slots with a seeded sample of the rest of the catalog
+        if len(ranked) < k:
+            chosen = set(ranked)
+            rest = [p for p in rng.sample(range(len(items)), min(len(items), k + len(chosen))) if p not in chosen]
+            ranked.extend(rest[:k - len(ranked)])
+        return [items[p] for p in ranked]
+
+
+_catalog = None
+_lock = threading.Lock()
+
+
+def get_catalog():
+    global _catalog
+    if _catalog is None:
+        with _lock:
+            if _catalog is None:
+                path = os.environ.get('RESUME_COURSES_FILE')
+                _catalog = CourseCatalog.from_file(path) if path else CourseCatalog.from_courses_module()
+    return _catalog
+
+
+def recommend_courses(catalog, missing_skills=(), k=5, seed=None):
+    return get_catalog().recommend(catalog, missing_skills, k, seed)
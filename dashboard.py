@@ -0,0 +1,151 @@
+# Admin dashboard data
+# Chart data comes from usage_summary, a (dimension, value) -> count table kept up to date
+# by a write-behind hook in the same transaction as the inserted rows, so loading the
+# dashboard costs the same however many analyses are stored. Raw tables are paged by ID.
+
+import threading
+from db import USER_DATA_COLUMNS, USER_FEEDBACK_COLUMNS
+
+# Table -> columns counted in usage_summary
+SUMMARY_DIMENSIONS = {
+    'user_data': ['Predicted_Field', 'User_level', 'resume_score', 'ip_add', 'city', 'state', 'country'],
+    'user_feedback': ['feed_score'],
+}
+TABLE_COLUMNS = {
+    'user_data': USER_DATA_COLUMNS,
+    'user_feedback': USER_FEEDBACK_COLUMNS,
+}
+TOTAL_DIMENSION = '_rows'
+MAX_VALUE_LENGTH = 255
+
+
+def dimension(table, column):
+    # "user_data.city": columns of the same name in different tables are counted apart
+    return f"{table}.{column}"
+
+
+def _value(value):
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', errors='replace')
+    return ('' if value is None else str(value))[:MAX_VALUE_LENGTH]
+
+
+def summary_increments(table, rows):
+    counts = {}
+    columns = TABLE_COLUMNS[table]
+    for column in SUMMARY_DIMENSIONS[table]:
+        position = columns.index(column)
+        for row in rows:
+            key = (dimension(table, column), _value(row[position]))
+            counts[key] = counts.get(key, 0) + 1
+    counts[(TOTAL_DIMENSION, table)] = len(rows)
+    return [(dimension, value, count) for (dimension, value), count in counts.items()]
+
+
+def summary_hook(pool):
+    def hook(conn, table, rows):
+        if table in SUMMARY_DIMENSIONS:
+            conn.cursor().executemany(pool.backend.adapt(pool.backend.increment_summary_sql),
+                                      summary_increments(table, rows))
+    return hook
+
+
+def rebuild_summary(pool):
+    # One-off GROUP BY rebuild for tables written before usage_summary existed
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM usage_summary")
+        insert = pool.backend.adapt(pool.backend.increment_summary_sql)
+        for table, dimensions in SUMMARY_DIMENSIONS.items():
+            for column in dimensions:
+                cursor.execute(f"SELECT {column}, COUNT(*) FROM {table} GROUP BY {column}")
+                grouped = {}
+                for value, count in cursor.fetchall():
+                    grouped[_value(value)] = grouped.get(_value(value), 0) + count
+                if grouped:
+                    cursor.executemany(insert, [(dimension(table, column), value, count)
+                                                for value, count in grouped.items()])
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            cursor.execute(insert, (TOTAL_DIMENSION, table, cursor.fetchone()[0]))
+        conn.commit()
+    invalidate()
+
+
+def ensure_summary(pool):
+    # Rebuild when the summary is empty or still keyed by bare column names
+    empty = pool.fetchone("SELECT COUNT(*) FROM usage_summary WHERE dimension = %s", (TOTAL_DIMENSION,))[0] == 0
+    if empty or pool.fetchone("SELECT COUNT(*) FROM usage_summary WHERE dimension <> %s AND dimension NOT LIKE %s",
+                              (TOTAL_DIMENSION, '%.%'))[0]:
+        rebuild_summary(pool)
+
+
+class AggregateCache:
+    def __init__(self):
+        self._values = {}
+        # Bumped by invalidate; a value loaded across an invalidation is returned but not kept
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, loader):
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+            # Registered before loading, so an invalidate that lands mid-load sees the key
+            generation = self._generations.setdefault(key, 0)
+        value = loader()
+        with self._lock:
+            if self._generations[key] == generation:
+                self._values[key] = value
+        return value
+
+    def invalidate(self, tables=None):
+        with self._lock:
+            keys = list(self._generations)
+            if tables is not None:
+                keys = [k for k in keys if k[0] in tables]
+            for key in keys:
+                self._values.pop(key, None)
+                self._generations[key] += 1
+
+
+_cache = AggregateCache()
+
+
+def invalidate(tables=None):
+    _cache.invalidate(tables)
+
+
+def install(pool, writer):
+    writer.add_hook(summary_hook(pool))
+    writer.add_listener(invalidate)
+
+
+def distribution(pool, table, column):
+    # [(value, count), ...] most common first
+    def load():
+        rows = pool.fetchall("SELECT dim_value, row_count FROM usage_summary WHERE dimension = %s AND row_count > 0 "
+                             "ORDER BY row_count DESC", (dimension(table, column),))
+        return [(value, count) for value, count in rows]
+    return _cache.get((table, column), load)
+
+
+def total_rows(pool, table):
+    def load():
+        row = pool.fetchone("SELECT row_count FROM usage_summary WHERE dimension = %s AND dim_value = %s",
+                            (TOTAL_DIMENSION, table))
+        return row[0] if row else 0
+    return _cache.get((table, TOTAL_DIMENSION), load)
+
+
+def fetch_page(pool, table, columns, after_id=None, before_id=None, limit=50):
+    # Keyset pagination on the primary key: rows after after_id (oldest first), or the page
+    # ending just before before_id; with neither, the newest page
+    select = f"SELECT ID, {', '.join(columns)} FROM {table}"
+    if after_id is not None:
+        rows = pool.fetchall(f"{select} WHERE ID > %s ORDER BY ID ASC LIMIT %s", (after_id, limit))
+    elif before_id is not None:
+        rows = pool.fetchall(f"{select} WHERE ID < %s ORDER BY ID DESC LIMIT %s", (before_id, limit))
+        rows = list(reversed(rows))
+    else:
+        rows = list(reversed(pool.fetchall(f"{select} ORDER BY ID DESC LIMIT %s", (limit,))))
+    return rows
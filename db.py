@@ -0,0 +1,435 @@
+# Database access layer
+# A bounded connection pool shared by all Streamlit sessions. Each operation checks a
+# connection out, runs, commits and returns it, so sessions never share a cursor.
+#
+# Backends (RESUME_DB_BACKEND):
+#   mysql  - RESUME_DB_HOST, RESUME_DB_USER, RESUME_DB_PASSWORD, RESUME_DB_NAME
+#   sqlite - RESUME_DB_PATH (no server needed; used for local runs and load tests)
+#
+# SQL is written with %s placeholders and adapted per backend.
+
+import os
+import time
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+try:
+    import pymysql
+except ImportError:
+    pymysql = None
+
+IntegrityError = (sqlite3.IntegrityError,) + ((pymysql.err.IntegrityError,) if pymysql else ())
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+USER_DATA_COLUMNS = [
+    'sec_token', 'ip_add', 'host_name', 'dev_user', 'os_name_ver', 'latlong', 'city', 'state', 'country',
+    'act_name', 'act_mail', 'act_mob', 'Name', 'Email_ID', 'resume_score', 'Timestamp', 'Page_no',
+    'Predicted_Field', 'User_level', 'Actual_skills', 'Recommended_skills', 'Recommended_courses', 'pdf_name',
+]
+USER_FEEDBACK_COLUMNS = ['feed_name', 'feed_email', 'feed_score', 'comments', 'Timestamp']
+
+
+def insert_sql(table, columns):
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+
+
+USER_DATA_INSERT = insert_sql('user_data', USER_DATA_COLUMNS)
+USER_FEEDBACK_INSERT = insert_sql('user_feedback', USER_FEEDBACK_COLUMNS)
+
+MYSQL_SCHEMA = [
+    "CREATE DATABASE IF NOT EXISTS cv",
+    """CREATE TABLE IF NOT EXISTS user_data (
+        ID INT AUTO_INCREMENT PRIMARY KEY,
+        sec_token VARCHAR(20),
+        ip_add VARCHAR(50),
+        host_name VARCHAR(50),
+        dev_user VARCHAR(50),
+        os_name_ver VARCHAR(50),
+        latlong VARCHAR(50),
+        city VARCHAR(50),
+        state VARCHAR(50),
+        country VARCHAR(50),
+        act_name VARCHAR(50),
+        act_mail VARCHAR(50),
+        act_mob VARCHAR(20),
+        Name VARCHAR(500),
+        Email_ID VARCHAR(500),
+        resume_score VARCHAR(8),
+        Timestamp VARCHAR(50),
+        Page_no VARCHAR(5),
+        Predicted_Field BLOB,
+        User_level BLOB,
+        Actual_skills BLOB,
+        Recommended_skills BLOB,
+        Recommended_courses BLOB,
+        pdf_name VARCHAR(50)
+    )""",
+    """CREATE TABLE IF NOT EXISTS user_feedback (
+        ID INT AUTO_INCREMENT PRIMARY KEY,
+        feed_name VARCHAR(50),
+        feed_email VARCHAR(50),
+        feed_score VARCHAR(5),
+        comments VARCHAR(100),
+        Timestamp VARCHAR(50)
+    )""",
+    """CREATE TABLE IF NOT EXISTS student_users (
+        ID INT AUTO_INCREMENT PRIMARY KEY,
+        username VARCHAR(50) UNIQUE,
+        password VARCHAR(100),
+        name VARCHAR(50),
+        email VARCHAR(50)
+    )""",
+    """CREATE TABLE IF NOT EXISTS usage_summary (
+        dimension VARCHAR(32),
+        dim_value VARCHAR(255),
+        row_count INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (dimension, dim_value)
+    )""",
+    """CREATE TABLE IF NOT EXISTS analyses (
+        ID INT AUTO_INCREMENT PRIMARY KEY,
+        user_data_id INT UNIQUE,
+        created_at DATETIME,
+        resume_score INT,
+        page_no INT,
+        predicted_field VARCHAR(100),
+        user_level VARCHAR(50),
+        INDEX idx_analyses_created (created_at),
+        INDEX idx_analyses_field (predicted_field, created_at)
+    )""",
+    """CREATE TABLE IF NOT EXISTS skills (
+        ID INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(255) UNIQUE
+    )""",
+    """CREATE TABLE IF NOT EXISTS analysis_skills (
+        analysis_id INT,
+        skill_id INT,
+        kind CHAR(1),
+        PRIMARY KEY (analysis_id, kind, skill_id),
+        INDEX idx_analysis_skills_skill (skill_id, kind)
+    )""",
+    """CREATE TABLE IF NOT EXISTS analysis_courses (
+        analysis_id INT,
+        position INT,
+        course VARCHAR(255),
+        PRIMARY KEY (analysis_id, position)
+    )""",
+]
+
+SQLITE_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS user_data (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        sec_token TEXT,
+        ip_add TEXT,
+        host_name TEXT,
+        dev_user TEXT,
+        os_name_ver TEXT,
+        latlong TEXT,
+        city TEXT,
+        state TEXT,
+        country TEXT,
+        act_name TEXT,
+        act_mail TEXT,
+        act_mob TEXT,
+        Name TEXT,
+        Email_ID TEXT,
+        resume_score TEXT,
+        Timestamp TEXT,
+        Page_no TEXT,
+        Predicted_Field TEXT,
+        User_level TEXT,
+        Actual_skills TEXT,
+        Recommended_skills TEXT,
+        Recommended_courses TEXT,
+        pdf_name TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS user_feedback (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        feed_name TEXT,
+        feed_email TEXT,
+        feed_score TEXT,
+        comments TEXT,
+        Timestamp TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS student_users (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE,
+        password TEXT,
+        name TEXT,
+        email TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS usage_summary (
+        dimension TEXT,
+        dim_value TEXT,
+        row_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (dimension, dim_value)
+    )""",
+    """CREATE TABLE IF NOT EXISTS analyses (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_data_id INTEGER UNIQUE,
+        created_at TEXT,
+        resume_score INTEGER,
+        page_no INTEGER,
+        predicted_field TEXT,
+        user_level TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_user_data_token ON user_data (sec_token)",
+    "CREATE INDEX IF NOT EXISTS idx_analyses_created ON analyses (created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_analyses_field ON analyses (predicted_field, created_at)",
+    """CREATE TABLE IF NOT EXISTS skills (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE
+    )""",
+    """CREATE TABLE IF NOT EXISTS analysis_skills (
+        analysis_id INTEGER,
+        skill_id INTEGER,
+        kind TEXT,
+        PRIMARY KEY (analysis_id, kind, skill_id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_analysis_skills_skill ON analysis_skills (skill_id, kind)",
+    """CREATE TABLE IF NOT EXISTS analysis_courses (
+        analysis_id INTEGER,
+        position INTEGER,
+        course TEXT,
+        PRIMARY KEY (analysis_id, position)
+    )""",
+]
+
+
+# Indexes added after the tables first shipped; MySQL has no CREATE INDEX IF NOT EXISTS, so
+# existing databases get them through ensure_indexes. The analytics hook looks new
+# user_data rows up by sec_token after every write-behind batch.
+MYSQL_INDEXES = [
+    ('idx_user_data_token', 'user_data', 'sec_token'),
+]
+
+
+class MySQLBackend:
+    name = 'mysql'
+    schema = MYSQL_SCHEMA
+    increment_summary_sql = ("INSERT INTO usage_summary (dimension, dim_value, row_count) VALUES (%s, %s, %s) "
+                             "ON DUPLICATE KEY UPDATE row_count = row_count + VALUES(row_count)")
+    insert_ignore = "INSERT IGNORE"
+
+    def __init__(self, host='localhost', user='root', password='your_password', db='cv'):
+        if pymysql is None:
+            raise Exception("PyMySQL is not installed; install it or set RESUME_DB_BACKEND=sqlite")
+        self.config = {'host': host, 'user': user, 'password': password, 'db': db}
+
+    def connect(self):
+        return pymysql.connect(**self.config)
+
+    def ping(self, conn):
+        conn.ping(reconnect=True)
+
+    def adapt(self, sql):
+        return sql
+
+    def stream_cursor(self, conn):
+        # Unbuffered: rows are read from the server as they are fetched
+        return conn.cursor(pymysql.cursors.SSCursor)
+
+    def ensure_indexes(self, cursor):
+        for name, table, columns in MYSQL_INDEXES:
+            cursor.execute(f"SHOW INDEX FROM {table} WHERE Key_name = %s", (name,))
+            if not cursor.fetchall():
+                cursor.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+
+
+class SQLiteBackend:
+    name = 'sqlite'
+    schema = SQLITE_SCHEMA
+    increment_summary_sql = ("INSERT INTO usage_summary (dimension, dim_value, row_count) VALUES (%s, %s, %s) "
+                             "ON CONFLICT (dimension, dim_value) DO UPDATE SET row_count = row_count + excluded.row_count")
+    insert_ignore = "INSERT OR IGNORE"
+
+    def __init__(self, path='resume_analyzer.db'):
+        self.path = path
+
+    def connect(self):
+        # Connections move between session threads through the pool, never concurrently
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def ping(self, conn):
+        conn.execute("SELECT 1")
+
+    def adapt(self, sql):
+        return sql.replace('%s', '?')
+
+    def stream_cursor(self, conn):
+        # sqlite3 cursors already step through results lazily
+        return conn.cursor()
+
+    def ensure_indexes(self, cursor):
+        # SQLite creates its indexes with IF NOT EXISTS in the schema itself
+        pass
+
+
+class ConnectionPool:
+    def __init__(self, backend, size=5, timeout=10, health_check_interval=30):
+        self.backend = backend
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _new_connection(self):
+        return self.backend.connect()
+
+    def _checkout(self):
+        try:
+            conn, last_used = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    return self._new_connection()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            try:
+                conn, last_used = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise PoolTimeout(f"No database connection available after {self.timeout}s")
+
+        # Only ping connections that sat idle long enough to have been dropped by the server
+        if time.monotonic() - last_used > self.health_check_interval:
+            try:
+                self.backend.ping(conn)
+            except Exception:
+                self._discard(conn)
+                with self._lock:
+                    self._created += 1
+                try:
+                    conn = self._new_connection()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+        return conn
+
+    def _discard(self, conn):
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self):
+        conn = self._checkout()
+        try:
+            yield conn
+        except IntegrityError:
+            conn.rollback()
+            self._idle.put((conn, time.monotonic()))
+            raise
+        except BaseException:
+            # The connection may be in an unknown state (including a stream abandoned
+            # mid-result); replace it rather than reuse it
+            self._discard(conn)
+            raise
+        else:
+            # Writers commit themselves; this ends the transaction a read opened. With autocommit
+            # off, MySQL would otherwise keep that REPEATABLE READ snapshot (and its metadata
+            # locks) into the next checkout, serving stale rows and blocking DDL
+            try:
+                conn.rollback()
+            except Exception:
+                self._discard(conn)
+                return
+            self._idle.put((conn, time.monotonic()))
+
+    def execute(self, sql, params=()):
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self.backend.adapt(sql), params)
+            conn.commit()
+            return cursor.lastrowid
+
+    def executemany(self, sql, rows):
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(self.backend.adapt(sql), rows)
+            conn.commit()
+            return cursor.rowcount
+
+    def fetchall(self, sql, params=()):
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self.backend.adapt(sql), params)
+            return cursor.fetchall()
+
+    def fetchone(self, sql, params=()):
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self.backend.adapt(sql), params)
+            return cursor.fetchone()
+
+    def stream(self, sql, params=(), chunk_size=1000):
+        # Yields lists of at most chunk_size rows, holding one connection until exhausted;
+        # memory use doesn't grow with the size of the result
+        with self.connection() as conn:
+            cursor = self.backend.stream_cursor(conn)
+            try:
+                cursor.execute(self.backend.adapt(sql), params)
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cursor.close()
+
+    def close(self):
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+
+def init_schema(pool):
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        for statement in pool.backend.schema:
+            cursor.execute(statement)
+        pool.backend.ensure_indexes(cursor)
+        conn.commit()
+
+
+def backend_from_env():
+    if os.environ.get('RESUME_DB_BACKEND', 'mysql').lower() == 'sqlite':
+        return SQLiteBackend(os.environ.get('RESUME_DB_PATH', 'resume_analyzer.db'))
+    return MySQLBackend(host=os.environ.get('RESUME_DB_HOST', 'localhost'),
+                        user=os.environ.get('RESUME_DB_USER', 'root'),
+                        password=os.environ.get('RESUME_DB_PASSWORD', 'your_password'),
+                        db=os.environ.get('RESUME_DB_NAME', 'cv'))
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(backend_from_env(), size=int(os.environ.get('RESUME_DB_POOL_SIZE', '5')))
+    return _pool
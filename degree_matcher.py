@@ -0,0 +1,215 @@
+# Degree and certification matcher
+# The taxonomy in data/degrees.json is compiled once into a token trie, so one pass over the
+# tokenised text finds every degree and certification however large the taxonomy grows.
+# Every way of writing a degree maps to its canonical name: "B.Tech", "B. Tech", "BTech",
+# "B-Tech" and "Bachelor's of Technology" all give "Bachelor of Technology".
+#
+# Taxonomy entries: {"name", "type": "degree" | "certification", "level", "aliases": [full
+# names], "context_aliases": [aliases that are also ordinary words], "abbreviations": [...],
+# "not_before" / "not_after": [words that veto a match when they follow / precede it]}.
+# Abbreviations of one or two letters (BE, ME, MA, MS) are also ordinary words and US state
+# codes. They only match when written with dots (B.E., M.A.) or in capitals next to an
+# education cue (in/of, a field of study, a year, an education heading), never right after
+# another heading on the same line ("SUMMARY ME 2019") and never as the state in an address
+# ("Boston, MA 02115").
+# Context aliases ("Master", "Bachelor") must be capitalised and near a cue other than in/of,
+# which "Master of Ceremonies" and "master of disguise" have too.
+
+import os
+import re
+import json
+import hashlib
+import threading
+from collections import namedtuple
+
+DEGREES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'degrees.json')
+
+# "B.Tech", "Ph.D.", "Bachelor's", "AZ-900" and "B-Tech" stay single tokens
+TOKEN_RE = re.compile(r"[A-Za-z0-9]+(?:['’.-][A-Za-z0-9]+)*\.?")
+STRICT_LENGTH = 2
+# How much context a trie match needs before it counts
+LENIENT, WORD, ABBREVIATION = 0, 1, 2
+# "TO BE", "ABOUT ME", "CONTACT ME": a capitalised short abbreviation after these is a word
+STRICT_BLOCKERS = {'to', 'about', 'contact', 'hire', 'call', 'email', 'message', 'let', 'will', 'can', 'may',
+                   'must', 'should', 'would', 'could', 'might', 'not', 'tell', 'give', 'help'}
+
+# Words within CUE_WINDOW tokens of a short abbreviation that show it is a degree
+CUE_WINDOW = 3
+EDUCATION_CUES = {
+    'in', 'of', 'degree', 'education', 'qualification', 'qualifications', 'graduated', 'graduate', 'completed',
+    'pursuing', 'pursued', 'university', 'college', 'institute', 'school', 'cgpa', 'gpa', 'percentage',
+    'honours', 'honors', 'hons', 'computer', 'science', 'sciences', 'engineering', 'mechanical', 'civil',
+    'electrical', 'electronics', 'chemical', 'aerospace', 'biotechnology', 'information', 'technology',
+    'english', 'economics', 'history', 'mathematics', 'maths', 'physics', 'chemistry', 'psychology',
+    'finance', 'cse', 'ece', 'eee', 'it', 'cs', 'mech', 'academic', 'academics', 'program', 'programme',
+}
+WORD_CUES = EDUCATION_CUES - {'in', 'of'}
+YEAR_RE = re.compile(r"(?:19|20)\d\d$")
+ZIP_RE = re.compile(r"\d{5}(?:-\d{4})?$")
+
+DegreeMatch = namedtuple('DegreeMatch', ['name', 'type', 'level', 'start', 'end'])
+
+_END = object()
+
+
+def _key(token):
+    return re.sub(r"['’.-]", '', token).lower()
+
+
+def tokenize(text):
+    return [(_key(m.group()), m.start(), m.end()) for m in TOKEN_RE.finditer(text)]
+
+
+def _phrase_keys(phrase):
+    return [key for key, _, _ in tokenize(phrase) if key]
+
+
+def _variants(keys):
+    # Bachelor / Bachelors / Bachelor's, "of" / "in"
+    variants = [keys]
+    if keys and keys[0] in ('bachelor', 'master'):
+        variants.append([keys[0] + 's'] + keys[1:])
+    for variant in list(variants):
+        if 'of' in variant:
+            variants.append(['in' if k == 'of' else k for k in variant])
+    return variants
+
+
+class DegreeIndex:
+    def __init__(self, entries):
+        self._trie = {}
+        self.entries = []
+        digest = hashlib.sha256()
+        for entry in entries:
+            digest.update(json.dumps(entry, sort_keys=True).encode('utf-8'))
+            position = len(self.entries)
+            self.entries.append((entry['name'], entry.get('type', 'degree'), entry.get('level'),
+                                 {w.lower() for w in entry.get('not_before', [])},
+                                 {w.lower() for w in entry.get('not_after', [])}))
+            for alias in [entry['name']] + list(entry.get('aliases', [])):
+                for keys in _variants(_phrase_keys(alias)):
+                    self._add(keys, position, LENIENT)
+            for alias in entry.get('context_aliases', []):
+                for keys in _variants(_phrase_keys(alias)):
+                    self._add(keys, position, WORD)
+            for abbreviation in entry.get('abbreviations', []):
+                compact = _key(re.sub(r'\s+', '', abbreviation))
+                mode = ABBREVIATION if len(compact) <= STRICT_LENGTH else LENIENT
+                self._add([compact], position, mode)
+                parts = [_key(p) for p in re.split(r"[.\s-]+", abbreviation) if _key(p)]
+                if len(parts) > 1:
+                    self._add(parts, position, mode)
+        self.size = len(self.entries)
+        self.version = digest.hexdigest()[:16]
+
+    def _add(self, keys, position, mode):
+        if not keys:
+            return
+        node = self._trie
+        for key in keys:
+            node = node.setdefault(key, {})
+        # First definition wins; a more lenient spelling of the same entry relaxes a strict one
+        current = node.get(_END)
+        if current is None or (current[0] == position and mode < current[1]):
+            node[_END] = (position, mode)
+
+    @classmethod
+    def from_file(cls, path=DEGREES_FILE):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _accept(self, text, tokens, i, j, mode):
+        if mode == LENIENT:
+            return True
+        # A full stop at the end may just close the sentence ("want to be.")
+        span = text[tokens[i][1]:tokens[j - 1][2]].rstrip('.')
+        if mode == WORD:
+            # "Wanted to master React", "Chess master", "Bachelor party"
+            return span[:1].isupper() and _education_context(text, tokens, i, j, WORD_CUES)
+        dotted = '.' in span
+        if not dotted and (not span.isupper() or (i > 0 and tokens[i - 1][0] in STRICT_BLOCKERS)):
+            return False
+        if not dotted and i > 0 and _heading_before(text, tokens, i):
+            return False
+        # "Boston, MA 02115": a state code after a city or before a ZIP code
+        if j < len(tokens) and ZIP_RE.match(text[tokens[j][1]:tokens[j][2]]):
+            return False
+        if i > 0 and text[tokens[i - 1][2]:tokens[i][1]].strip() == ',' and text[tokens[i - 1][1]].isupper():
+            return False
+        # Dotted forms are rarely anything but degrees; bare capitals need an education cue
+        return dotted or _education_context(text, tokens, i, j, EDUCATION_CUES)
+
+    def match(self, text, types=None):
+        tokens = tokenize(text)
+        matches = []
+        i = 0
+        n = len(tokens)
+        while i < n:
+            # Longest acceptable match starting at token i
+            node = self._trie
+            best = None
+            j = i
+            while j < n:
+                node = node.get(tokens[j][0])
+                if node is None:
+                    break
+                j += 1
+                terminal = node.get(_END)
+                if terminal is not None and self._accept(text, tokens, i, j, terminal[1]):
+                    best = (terminal[0], j)
+            if best:
+                position, end = best
+                name, kind, level, not_before, not_after = self.entries[position]
+                vetoed = (end < n and tokens[end][0] in not_before) or (i > 0 and tokens[i - 1][0] in not_after)
+                if not vetoed and (types is None or kind in types):
+                    start, stop = tokens[i][1], tokens[end - 1][2]
+                    # Keep the final dot of "B.E." but not the full stop after "PhD."
+                    if text[stop - 1] == '.' and '.' not in text[start:stop - 1]:
+                        stop -= 1
+                    matches.append(DegreeMatch(name, kind, level, start, stop))
+                i = end
+            else:
+                i += 1
+        return matches
+
+    def extract(self, text, types=('degree',)):
+        return list(dict.fromkeys(m.name for m in self.match(text, types)))
+
+
+def _education_context(text, tokens, i, j, cues):
+    for k in range(max(0, i - CUE_WINDOW), min(len(tokens), j + CUE_WINDOW)):
+        if i <= k < j:
+            continue
+        if tokens[k][0] in cues or YEAR_RE.match(text[tokens[k][1]:tokens[k][2]].rstrip('.')):
+            return True
+    return False
+
+
+def _heading_before(text, tokens, i):
+    # "SUMMARY ME 2019": a capitalised word on the same line that isn't about education
+    previous = text[tokens[i - 1][1]:tokens[i - 1][2]]
+    between = text[tokens[i - 1][2]:tokens[i][1]]
+    return (previous.isalpha() and len(previous) > STRICT_LENGTH and previous.isupper() and '\n' not in between
+            and tokens[i - 1][0] not in EDUCATION_CUES)
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def load_degree_index(path=None):
+    path = os.path.abspath(path or DEGREES_FILE)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime, stat.st_size)
+
+    index = _indexes.get(key)
+    if index is None:
+        with _lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = DegreeIndex.from_file(path)
+                # Drop indexes compiled from older versions of the same file
+                for old in [k for k in _indexes if k[0] == path]:
+                    del _indexes[old]
+                _indexes[key] = index
+    return index
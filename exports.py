@@ -0,0 +1,165 @@
+# Streaming exports of analysis data
+# Rows are read from the database in fixed-size chunks and written straight to CSV, JSON
+# Lines or Parquet, so memory stays bounded however many records are exported. Parquet
+# files get one row group per chunk.
+#
+# Usage:
+#   python exports.py report.parquet --table user_data --columns Name,resume_score --since 2024-01-01
+
+import os
+import csv
+import sys
+import json
+import argparse
+import datetime
+from db import USER_DATA_COLUMNS, USER_FEEDBACK_COLUMNS, get_pool
+from analytics import TIMESTAMP_FORMAT, DB_TIMESTAMP_FORMAT
+
+FORMATS = ('csv', 'jsonl', 'parquet')
+DEFAULT_CHUNK_SIZE = 1000
+
+# Exportable tables: columns, the column date ranges filter on and how it stores dates
+EXPORT_TABLES = {
+    'user_data': {'columns': ['ID'] + USER_DATA_COLUMNS, 'time_column': 'Timestamp',
+                  'time_format': TIMESTAMP_FORMAT},
+    'user_feedback': {'columns': ['ID'] + USER_FEEDBACK_COLUMNS, 'time_column': 'Timestamp',
+                      'time_format': TIMESTAMP_FORMAT},
+    'analyses': {'columns': ['ID', 'user_data_id', 'created_at', 'resume_score', 'page_no', 'predicted_field',
+                             'user_level'],
+                 'time_column': 'created_at', 'time_format': DB_TIMESTAMP_FORMAT},
+}
+INTEGER_COLUMNS = {'ID', 'user_data_id', 'resume_score', 'page_no'}
+
+
+def _cell(value):
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.strftime(DB_TIMESTAMP_FORMAT)
+    return value
+
+
+def format_from_path(path):
+    ext = os.path.splitext(path)[1].lower().lstrip('.')
+    return {'json': 'jsonl', 'pq': 'parquet'}.get(ext, ext)
+
+
+def export_query(table='user_data', columns=None, since=None, until=None):
+    if table not in EXPORT_TABLES:
+        raise Exception(f"Unknown export table: {table}")
+    spec = EXPORT_TABLES[table]
+    columns = list(columns) if columns else spec['columns']
+    unknown = [c for c in columns if c not in spec['columns']]
+    if unknown:
+        raise Exception(f"Unknown columns for {table}: {', '.join(unknown)}")
+
+    # Both timestamp layouts sort as text in date order, so the range is a string comparison
+    clauses = []
+    params = []
+    if since is not None:
+        clauses.append(f"{spec['time_column']} >= %s")
+        params.append(since.strftime(spec['time_format']))
+    if until is not None:
+        clauses.append(f"{spec['time_column']} < %s")
+        params.append(until.strftime(spec['time_format']))
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return f"SELECT {', '.join(columns)} FROM {table}{where} ORDER BY ID", params, columns
+
+
+def _write_csv(f, columns, chunks):
+    writer = csv.writer(f)
+    writer.writerow(columns)
+    total = 0
+    for rows in chunks:
+        writer.writerows([[_cell(v) for v in row] for row in rows])
+        total += len(rows)
+    return total
+
+
+def _write_jsonl(f, columns, chunks):
+    total = 0
+    for rows in chunks:
+        f.write(''.join(json.dumps(dict(zip(columns, map(_cell, row))), default=str) + '\n' for row in rows))
+        total += len(rows)
+    return total
+
+
+def _parquet_value(column, value):
+    value = _cell(value)
+    if value is None:
+        return None
+    if column in INTEGER_COLUMNS:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    return str(value)
+
+
+def _write_parquet(path, columns, chunks):
+    # pyarrow takes a while to import, so only Parquet exports pay for it
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise Exception("pyarrow is not installed; install it or export to csv/jsonl")
+    schema = pa.schema([(c, pa.int64() if c in INTEGER_COLUMNS else pa.string()) for c in columns])
+    total = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in chunks:
+            arrays = [pa.array([_parquet_value(c, row[i]) for row in rows], type=schema.field(c).type)
+                      for i, c in enumerate(columns)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            total += len(rows)
+        if total == 0:
+            # An empty export is still a readable file
+            writer.write_table(schema.empty_table())
+    return total
+
+
+def export(pool, path, fmt=None, table='user_data', columns=None, since=None, until=None,
+           chunk_size=DEFAULT_CHUNK_SIZE):
+    # Returns the number of rows written; the file only appears once it is complete
+    fmt = fmt or format_from_path(path)
+    if fmt not in FORMATS:
+        raise Exception(f"Unsupported export format: {fmt} (use one of {', '.join(FORMATS)})")
+    sql, params, columns = export_query(table, columns, since, until)
+    chunks = pool.stream(sql, params, chunk_size)
+    tmp_path = path + '.tmp'
+    try:
+        if fmt == 'parquet':
+            total = _write_parquet(tmp_path, columns, chunks)
+        else:
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                total = (_write_csv if fmt == 'csv' else _write_jsonl)(f, columns, chunks)
+        os.replace(tmp_path, path)
+    finally:
+        chunks.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return total
+
+
+def _date(value):
+    return datetime.datetime.fromisoformat(value)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Export analysis data to CSV, JSON Lines or Parquet.")
+    arg_parser.add_argument('output')
+    arg_parser.add_argument('--format', choices=FORMATS, default=None, help="default: from the output extension")
+    arg_parser.add_argument('--table', choices=sorted(EXPORT_TABLES), default='user_data')
+    arg_parser.add_argument('--columns', default=None, help="comma-separated subset of the table's columns")
+    arg_parser.add_argument('--since', type=_date, default=None, help="inclusive start, e.g. 2024-01-01")
+    arg_parser.add_argument('--until', type=_date, default=None, help="exclusive end, e.g. 2024-02-01")
+    arg_parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = arg_parser.parse_args(argv)
+    columns = [c.strip() for c in args.columns.split(',') if c.strip()] if args.columns else None
+
+    total = export(get_pool(), args.output, args.format, args.table, columns, args.since, args.until, args.chunk_size)
+    print(f"Exported {total} rows -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+# Career field prediction
+# Fields are loaded from data/fields.json into a keyword -> field inverted index, and every
+# skill of a candidate is scored against all fields in one pass.
+#
+# A keyword is either a string (weight 1) or a [keyword, weight] pair. Fields marked
+# "supported": false (e.g. generic soft skills) only win when no supported field matches.
+
+import os
+import json
+import threading
+
+FIELDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'fields.json')
+
+
+class FieldClassifier:
+    def __init__(self, fields):
+        self.fields = fields
+        self._index = {}
+        for position, field in enumerate(fields):
+            for keyword in field.get('keywords', []):
+                weight = 1.0
+                if isinstance(keyword, (list, tuple)):
+                    keyword, weight = keyword
+                self._index.setdefault(keyword.strip().lower(), []).append((position, float(weight)))
+
+    @classmethod
+    def from_file(cls, path=FIELDS_FILE):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def classify(self, skills):
+        scores = {}
+        matched = {}
+        for skill in dict.fromkeys(s.strip().lower() for s in skills):
+            for position, weight in self._index.get(skill, ()):
+                scores[position] = scores.get(position, 0.0) + weight
+                matched.setdefault(position, []).append(skill)
+
+        total = sum(scores.values())
+        # Supported fields first, then by score; file order breaks ties
+        positions = sorted(scores, key=lambda p: (not self.fields[p].get('supported', True), -scores[p], p))
+        ranked = []
+        for position in positions:
+            field = self.fields[position]
+            score = scores[position]
+            ranked.append({
+                'field': field['name'],
+                'key': field.get('key', field['name']),
+                'score': score,
+                'confidence': score / total if total else 0.0,
+                'matched': matched[position],
+                'supported': field.get('supported', True),
+                'recommended_skills': list(field.get('recommended_skills', [])),
+                'courses': field.get('courses'),
+            })
+        return ranked
+
+    def predict(self, skills):
+        ranked = self.classify(skills)
+        return ranked[0] if ranked else None
+
+
+_classifiers = {}
+_lock = threading.Lock()
+
+
+def load_field_classifier(path=FIELDS_FILE):
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime, stat.st_size)
+    classifier = _classifiers.get(key)
+    if classifier is None:
+        with _lock:
+            classifier = _classifiers.get(key)
+            if classifier is None:
+                classifier = FieldClassifier.from_file(path)
+                # Drop classifiers built from older versions of the same file
+                for old in [k for k in _classifiers if k[0] == key[0]]:
+                    del _classifiers[old]
+                _classifiers[key] = classifier
+    return classifier
+
+
+def predict_field(skills, path=FIELDS_FILE):
+    return load_field_classifier(path).predict(skills)
@@ -0,0 +1,164 @@
+# Local file endpoint
+# Uploaded resumes and admin exports are served by a small tornado server on a side port, so
+# pages reference them by URL instead of pushing base64 copies through the Streamlit
+# websocket. tornado's StaticFileHandler streams files in chunks and handles Range requests,
+# ETag / If-None-Match and Last-Modified. URLs are signed with an HMAC and expire, because
+# resumes hold personal data and the directories must not be browsable.
+#
+# RESUME_FILE_PORT / RESUME_FILE_ADDRESS choose where it listens (default 127.0.0.1:8601);
+# RESUME_FILE_BASE_URL is the address browsers reach it at (e.g. behind a reverse proxy);
+# without it the app doesn't hand out links and embeds files instead.
+# RESUME_FILE_SECRET keeps links valid across restarts and between several app processes.
+# The same port serves /metrics (Prometheus text, see instrumentation.py).
+
+import os
+import time
+import hmac
+import asyncio
+import hashlib
+import secrets
+import threading
+from urllib.parse import quote, urlencode
+from tornado import web, httpserver, ioloop
+import instrumentation
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+UPLOAD_DIR = os.path.join(BASE_DIR, 'Uploaded_Resumes')
+EXPORT_DIR = os.path.join(BASE_DIR, 'Exports')
+DEFAULT_ROOTS = {'uploads': UPLOAD_DIR, 'exports': EXPORT_DIR}
+DEFAULT_PORT = int(os.environ.get('RESUME_FILE_PORT', '8601'))
+DEFAULT_ADDRESS = os.environ.get('RESUME_FILE_ADDRESS', '127.0.0.1')
+DEFAULT_TTL = int(os.environ.get('RESUME_FILE_URL_TTL', '3600'))
+IDLE_TIMEOUT = 75
+
+
+class SignedFileHandler(web.StaticFileHandler):
+    def initialize(self, path, name, server):
+        super().initialize(path)
+        self.name = name
+        self.server = server
+
+    def prepare(self):
+        try:
+            self.expires = int(self.get_query_argument('expires', ''))
+        except ValueError:
+            raise web.HTTPError(403)
+        self.download = self.get_query_argument('download', '')
+        signature = self.get_query_argument('sig', '')
+        if not self.server.verify(self.name, self.path_args[0], self.expires, self.download, signature):
+            raise web.HTTPError(403)
+
+    def get_cache_time(self, path, modified, mime_type):
+        # Browsers may reuse the file until its link expires
+        return max(0, self.expires - int(time.time()))
+
+    def set_extra_headers(self, path):
+        self.set_header('Cache-Control', f"private, max-age={self.get_cache_time(path, None, None)}")
+        if self.download:
+            self.set_header('Content-Disposition', f"attachment; filename*=UTF-8''{quote(self.download)}")
+        else:
+            self.set_header('Content-Disposition', 'inline')
+
+
+class MetricsHandler(web.RequestHandler):
+    def get(self):
+        self.set_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.finish(instrumentation.render_prometheus())
+
+
+class FileServer:
+    def __init__(self, roots=None, port=DEFAULT_PORT, address=DEFAULT_ADDRESS, base_url=None, secret=None,
+                 ttl=DEFAULT_TTL):
+        self.roots = {name: os.path.abspath(path) for name, path in (roots or DEFAULT_ROOTS).items()}
+        self.port = port
+        self.address = address
+        base_url = base_url or os.environ.get('RESUME_FILE_BASE_URL')
+        # Only a configured base URL is known to be reachable from other machines; the localhost
+        # default works for a browser running next to the app and nowhere else
+        self.linkable = bool(base_url)
+        self.base_url = (base_url or f"http://localhost:{port}").rstrip('/')
+        secret = secret or os.environ.get('RESUME_FILE_SECRET')
+        self._secret = secret.encode('utf-8') if secret else secrets.token_bytes(32)
+        self.ttl = ttl
+        self._loop = None
+        self._thread = None
+        for path in self.roots.values():
+            os.makedirs(path, exist_ok=True)
+
+    def _sign(self, root, relpath, expires, download):
+        message = f"{root}/{relpath}|{expires}|{download}".encode('utf-8')
+        return hmac.new(self._secret, message, hashlib.sha256).hexdigest()
+
+    def verify(self, root, relpath, expires, download, signature):
+        if expires < time.time():
+            return False
+        return hmac.compare_digest(self._sign(root, relpath, expires, download), signature)
+
+    def url(self, root, path, download=None):
+        base = self.roots[root]
+        full = os.path.abspath(os.path.join(base, path))
+        if os.path.commonpath([base, full]) != base:
+            raise Exception(f"{path} is outside the {root} directory")
+        relpath = os.path.relpath(full, base).replace(os.sep, '/')
+        # Expiry is rounded to the TTL so the same file keeps the same URL for a while; reruns
+        # then render identical links and the browser cache stays warm
+        expires = (int(time.time()) // self.ttl + 2) * self.ttl
+        query = {'expires': expires, 'sig': self._sign(root, relpath, expires, download or '')}
+        if download:
+            query['download'] = download
+        return f"{self.base_url}/{root}/{quote(relpath)}?{urlencode(query)}"
+
+    def prune(self, root, max_age):
+        # Remove files older than max_age seconds, e.g. exports nobody downloaded
+        cutoff = time.time() - max_age
+        for dirpath, _, names in os.walk(self.roots[root]):
+            for name in names:
+                path = os.path.join(dirpath, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                except OSError:
+                    continue
+
+    def _serve(self, ready, errors):
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        try:
+            routes = [(rf"/{name}/(.*)", SignedFileHandler, {'path': path, 'name': name, 'server': self})
+                      for name, path in self.roots.items()]
+            app = web.Application(routes + [(r"/metrics", MetricsHandler)])
+            server = httpserver.HTTPServer(app, idle_connection_timeout=IDLE_TIMEOUT)
+            server.listen(self.port, self.address)
+        except Exception as e:
+            errors.append(e)
+            ready.set()
+            return
+        self._loop = ioloop.IOLoop.current()
+        ready.set()
+        self._loop.start()
+
+    def start(self):
+        ready = threading.Event()
+        errors = []
+        self._thread = threading.Thread(target=self._serve, args=(ready, errors), name='file-server', daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise Exception(f"Could not start file server on {self.address}:{self.port}: {str(errors[0])}")
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.add_callback(self._loop.stop)
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def get_file_server():
+    global _server
+    if _server is None:
+        with _server_lock:
+            if _server is None:
+                _server = FileServer().start()
+    return _server
@@ -0,0 +1,196 @@
+# Offline IP geolocation
+# Resolves IP -> city/state/country from a local IP range database (DB-IP "lite" city CSV
+# layout: ip_start, ip_end, continent, country, stateprov, city, latitude, longitude) with a
+# bisect over sorted range starts. No network calls; lookups are cached per IP with a TTL
+# and run on a background thread so page rendering never waits on them.
+#
+# RESUME_GEOIP_DB points at the CSV file (default: data/ip_city.csv). Without it every
+# lookup resolves to an unknown location.
+# The host is located by its public address: RESUME_PUBLIC_IP when set, else the host's own
+# address if it is public, else one request to RESUME_PUBLIC_IP_URL (default api.ipify.org,
+# empty to stay fully offline) made in the background once per process.
+
+import os
+import csv
+import time
+import socket
+import bisect
+import getpass
+import platform
+import threading
+import ipaddress
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+GEOIP_DB = os.environ.get('RESUME_GEOIP_DB',
+                          os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ip_city.csv'))
+CACHE_TTL = float(os.environ.get('RESUME_GEOIP_TTL', '3600'))
+MAX_CACHE_ENTRIES = 10000
+PUBLIC_IP_URL = os.environ.get('RESUME_PUBLIC_IP_URL', 'https://api.ipify.org')
+PUBLIC_IP_TIMEOUT = 3
+
+UNKNOWN = {'latlong': None, 'city': '', 'state': '', 'country': ''}
+
+
+class IPRangeIndex:
+    def __init__(self, rows):
+        # One sorted table per IP version; rows are (start, end, location)
+        self._starts = {4: [], 6: []}
+        self._ranges = {4: [], 6: []}
+        for start, end, location in sorted(rows, key=lambda r: (r[0].version, int(r[0]))):
+            self._starts[start.version].append(int(start))
+            self._ranges[start.version].append((int(end), location))
+
+    @classmethod
+    def from_csv(cls, path):
+        rows = []
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for record in csv.reader(f):
+                if len(record) < 8:
+                    continue
+                try:
+                    start = ipaddress.ip_address(record[0])
+                    end = ipaddress.ip_address(record[1])
+                    latlong = [float(record[6]), float(record[7])]
+                except ValueError:
+                    # Header line or malformed row
+                    continue
+                rows.append((start, end, {'latlong': latlong, 'city': record[5], 'state': record[4],
+                                          'country': record[3]}))
+        return cls(rows)
+
+    def lookup(self, ip):
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        starts = self._starts[address.version]
+        position = bisect.bisect_right(starts, int(address)) - 1
+        if position < 0:
+            return None
+        end, location = self._ranges[address.version][position]
+        return location if int(address) <= end else None
+
+
+class GeoLocator:
+    def __init__(self, db_path=GEOIP_DB, ttl=CACHE_TTL):
+        self.db_path = db_path
+        self.ttl = ttl
+        self._index = None
+        self._index_lock = threading.Lock()
+        # Insertion-ordered, so the oldest entry is evicted first when it is full
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='geolocation')
+
+    def _get_index(self):
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    if self.db_path and os.path.exists(self.db_path):
+                        self._index = IPRangeIndex.from_csv(self.db_path)
+                    else:
+                        self._index = IPRangeIndex([])
+        return self._index
+
+    def lookup(self, ip):
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._cache.get(ip)
+            if cached and cached[0] > now:
+                return dict(cached[1])
+
+        location = self._get_index().lookup(ip) if _is_public(ip) else None
+        location = dict(location or UNKNOWN)
+
+        with self._cache_lock:
+            self._cache.pop(ip, None)
+            self._cache[ip] = (now + self.ttl, location)
+            while len(self._cache) > MAX_CACHE_ENTRIES:
+                self._cache.popitem(last=False)
+        return dict(location)
+
+    def lookup_async(self, ip):
+        return self._executor.submit(self.lookup, ip)
+
+    def locate_host_async(self):
+        # Resolving the public address may take a network round trip, so it runs here too
+        return self._executor.submit(lambda: self.lookup(public_ip()))
+
+    def warm_up(self):
+        # Load the range database in the background at startup
+        return self._executor.submit(self._get_index)
+
+
+def _is_public(ip):
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    return not (address.is_private or address.is_loopback)
+
+
+_host_info = None
+
+
+def host_info():
+    # Host details don't change while the server runs; resolve them once
+    global _host_info
+    if _host_info is None:
+        host_name = socket.gethostname()
+        try:
+            ip_add = socket.gethostbyname(host_name)
+        except OSError:
+            ip_add = '127.0.0.1'
+        try:
+            dev_user = getpass.getuser()
+        except Exception:
+            dev_user = ''
+        _host_info = {'host_name': host_name, 'ip_add': ip_add, 'dev_user': dev_user,
+                      'os_name_ver': f"{platform.system()} {platform.release()}"}
+    return dict(_host_info)
+
+
+_public_ip = None
+_public_ip_lock = threading.Lock()
+
+
+def public_ip():
+    # Resolved once per process; falls back to the host's own address
+    global _public_ip
+    if _public_ip is None:
+        with _public_ip_lock:
+            if _public_ip is None:
+                _public_ip = _resolve_public_ip()
+    return _public_ip
+
+
+def _resolve_public_ip():
+    if os.environ.get('RESUME_PUBLIC_IP'):
+        return os.environ['RESUME_PUBLIC_IP']
+    local = host_info()['ip_add']
+    if _is_public(local) or not PUBLIC_IP_URL:
+        return local
+    try:
+        with urllib.request.urlopen(PUBLIC_IP_URL, timeout=PUBLIC_IP_TIMEOUT) as response:
+            address = response.read(64).decode('ascii', errors='replace').strip()
+        ipaddress.ip_address(address)
+        return address
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not resolve the public IP ({str(e)}); set RESUME_PUBLIC_IP to locate users")
+        return local
+
+
+_locator = None
+_locator_lock = threading.Lock()
+
+
+def get_locator():
+    global _locator
+    if _locator is None:
+        with _locator_lock:
+            if _locator is None:
+                _locator = GeoLocator()
+                _locator.warm_up()
+    return _locator
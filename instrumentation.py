@@ -0,0 +1,227 @@
+# Stage timings and counters
+# Parsing, scoring and persistence record how long each stage took (extract, pages, nlp,
+# custom_nlp, skills, score, persist), document sizes, cache hits and errors. Metrics are
+# exported as Prometheus text (render_prometheus) and optionally as one JSON log line per
+# stage. Worker processes hand their metrics to the parent with drain() / merge().
+#
+# Off unless RESUME_METRICS=1; when off, stage() returns a shared no-op context manager and
+# the other calls return after a single flag check. RESUME_METRICS_LOG=1 adds the logs.
+
+import os
+import json
+import time
+import logging
+import threading
+
+TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PAGE_BUCKETS = (1, 2, 3, 5, 10, 20, 50)
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+BUCKETS = {
+    'resume_document_pages': PAGE_BUCKETS,
+    'resume_document_bytes': SIZE_BUCKETS,
+    'resume_document_chars': SIZE_BUCKETS,
+}
+
+
+def _flag(name):
+    return os.environ.get(name, '').lower() not in ('', '0', 'false', 'no')
+
+
+_enabled = _flag('RESUME_METRICS')
+_log_enabled = _enabled and _flag('RESUME_METRICS_LOG')
+_logger = logging.getLogger('resume_analyzer.metrics')
+
+
+class Registry:
+    def __init__(self):
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, labels=()):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, labels=()):
+        key = (name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                buckets = BUCKETS.get(name, TIME_BUCKETS)
+                histogram = self._histograms[key] = [buckets, [0] * len(buckets), 0.0, 0]
+            buckets, counts = histogram[0], histogram[1]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            histogram[2] += value
+            histogram[3] += 1
+
+    def snapshot(self, reset=False):
+        # Plain lists, so it pickles and serialises as JSON
+        with self._lock:
+            snapshot = {'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                        'histograms': [[name, list(labels), list(h[0]), list(h[1]), h[2], h[3]]
+                                       for (name, labels), h in self._histograms.items()]}
+            if reset:
+                self._counters.clear()
+                self._histograms.clear()
+        return snapshot
+
+    def merge(self, snapshot):
+        with self._lock:
+            for name, labels, value in snapshot.get('counters', []):
+                key = (name, tuple(tuple(item) for item in labels))
+                self._counters[key] = self._counters.get(key, 0) + value
+            for name, labels, buckets, counts, total, count in snapshot.get('histograms', []):
+                key = (name, tuple(tuple(item) for item in labels))
+                histogram = self._histograms.get(key)
+                if histogram is None or list(histogram[0]) != list(buckets):
+                    histogram = self._histograms[key] = [tuple(buckets), [0] * len(buckets), 0.0, 0]
+                for i, c in enumerate(counts):
+                    histogram[1][i] += c
+                histogram[2] += total
+                histogram[3] += count
+
+    def render_prometheus(self):
+        snapshot = self.snapshot()
+        lines = []
+        typed = set()
+        for name, labels, value in sorted(snapshot['counters']):
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{_labels(labels)} {value}")
+        for name, labels, buckets, counts, total, count in sorted(snapshot['histograms'], key=lambda h: (h[0], h[1])):
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, c in zip(buckets, counts):
+                cumulative += c
+                lines.append(f"{name}_bucket{_labels(labels, ('le', _number(bound)))} {cumulative}")
+            lines.append(f"{name}_bucket{_labels(labels, ('le', '+Inf'))} {count}")
+            lines.append(f"{name}_sum{_labels(labels)} {total}")
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+        return '\n'.join(lines) + '\n'
+
+
+def _number(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _labels(labels, extra=None):
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ''
+    escaped = [(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for k, v in items]
+    return '{' + ','.join(f'{k}="{v}"' for k, v in escaped) + '}'
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+_registry = Registry()
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **fields):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+
+    def set(self, **fields):
+        # Extra details for the log line, e.g. the page count once it is known
+        self.fields.update(fields)
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self._started
+        labels = (('stage', self.name),)
+        _registry.observe('resume_stage_seconds', seconds, labels)
+        if exc_type is not None:
+            _registry.inc('resume_stage_errors_total', 1, labels)
+        if _log_enabled:
+            log_event('stage', stage=self.name, ms=round(seconds * 1000, 3), ok=exc_type is None,
+                      error=str(exc) if exc is not None else None, **self.fields)
+        return False
+
+
+def stage(name, **fields):
+    # with instrumentation.stage('nlp', chars=len(text)): ...
+    if not _enabled:
+        return _NULL_STAGE
+    return _Stage(name, fields)
+
+
+def count(name, value=1, **labels):
+    if _enabled:
+        _registry.inc(name, value, _label_key(labels))
+
+
+def observe(name, value, **labels):
+    if _enabled:
+        _registry.observe(name, value, _label_key(labels))
+
+
+def log_event(event, **fields):
+    if not _log_enabled:
+        return
+    if not _logger.handlers and not logging.getLogger().handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        _logger.addHandler(handler)
+        _logger.setLevel(logging.INFO)
+    _logger.info(json.dumps({'ts': round(time.time(), 3), 'event': event, **fields}, default=str))
+
+
+def enabled():
+    return _enabled
+
+
+def enable(log=False):
+    global _enabled, _log_enabled
+    _enabled = True
+    _log_enabled = log
+
+
+def disable():
+    global _enabled, _log_enabled
+    _enabled = False
+    _log_enabled = False
+
+
+def drain():
+    # Takes everything recorded so far (used by worker processes to report to the parent)
+    return _registry.snapshot(reset=True)
+
+
+def merge(snapshot):
+    if snapshot:
+        _registry.merge(snapshot)
+
+
+def snapshot():
+    return _registry.snapshot()
+
+
+def render_prometheus():
+    return _registry.render_prometheus()
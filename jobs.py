@@ -0,0 +1,291 @@
+# Asynchronous resume analysis jobs
+# Resumes are analysed in a pool of worker processes that load the spaCy models once at
+# start-up, so a slow PDF never blocks a Streamlit session and CPU-bound parsing doesn't
+# compete with the server for the GIL. Callers submit bytes, get a job id back and poll
+# its status; workers report each stage (text extracted, entities, score) as it finishes.
+#
+# RESUME_JOB_WORKERS sets the number of worker processes, RESUME_JOB_QUEUE the number of
+# jobs that may be queued or running at once before submit() refuses new ones.
+
+import os
+import time
+import uuid
+import asyncio
+import copy
+import queue
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+import instrumentation
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED = (DONE, FAILED, CANCELLED)
+
+DEFAULT_WORKERS = int(os.environ.get('RESUME_JOB_WORKERS', str(min(2, os.cpu_count() or 1))))
+DEFAULT_MAX_ACTIVE = int(os.environ.get('RESUME_JOB_QUEUE', '32'))
+DEFAULT_RETENTION = 3600
+
+
+class QueueFull(Exception):
+    pass
+
+
+class JobCancelled(Exception):
+    pass
+
+
+# Worker process state, set by _init_worker
+_progress = None
+_cancelled = None
+
+
+def _init_worker(progress, cancelled):
+    global _progress, _cancelled
+    _progress = progress
+    _cancelled = cancelled
+    try:
+        import nlp_models
+        nlp_models.warm_up()
+    except Exception as e:
+        print(f"Warning: Could not preload NLP models in worker: {str(e)}")
+
+
+def _ping():
+    return os.getpid()
+
+
+def _report(job_id, stage, value):
+    if _cancelled is not None and job_id in _cancelled:
+        raise JobCancelled(job_id)
+    _progress.put((job_id, stage, value))
+
+
+def _run_job(job_id, data, name, options):
+    try:
+        return _analyse(job_id, data, name, options)
+    finally:
+        # Stage timings recorded in this worker are merged into the parent's metrics
+        if instrumentation.enabled():
+            _progress.put((job_id, 'metrics', instrumentation.drain()))
+
+
+def _analyse(job_id, data, name, options):
+    # The parsing stack (spaCy, pdfminer) is only imported in the workers, never by the
+    # process that owns the queue
+    from result_cache import get_default_cache
+    from resume_scoring import score_resume
+    from field_classifier import predict_field
+
+    _report(job_id, 'started', os.getpid())
+
+    def report_text(document):
+        _report(job_id, 'text', {'text': document.text_raw, 'page_count': document.page_count,
+                                 'truncated': document.truncated})
+
+    # Finished analyses are shared with the app through the content-hash cache; a hit rebuilds
+    # the same document a miss would have extracted. Every job is scored, so the text is read
+    # in full rather than stopping once the contact details are found
+    details, document = get_default_cache().parse(
+        data, name=name, skills_file=options.get('skills_file'), custom_regex=options.get('custom_regex'),
+        fields=options.get('fields'), max_pages=options.get('max_pages'), max_chars=options.get('max_chars'),
+        full_text=True, on_document=report_text)
+    text_raw, page_count, truncated = document.text_raw, document.page_count, document.truncated
+    _report(job_id, 'details', details)
+
+    score = score_resume(text_raw, page_count=page_count or 0)
+    _report(job_id, 'score', score)
+    prediction = predict_field(details.get('skills') or [])
+    return {'text': {'text': text_raw, 'page_count': page_count, 'truncated': truncated},
+            'details': details, 'score': score, 'prediction': prediction}
+
+
+class JobQueue:
+    def __init__(self, workers=DEFAULT_WORKERS, max_active=DEFAULT_MAX_ACTIVE, retention=DEFAULT_RETENTION,
+                 start_method='spawn'):
+        # spawn, not fork: the server process has live threads (write-behind, geolocation)
+        # whose locks a forked child would inherit mid-use
+        context = multiprocessing.get_context(start_method)
+        self.workers = workers
+        self.max_active = max_active
+        self.retention = retention
+        self._manager = context.Manager()
+        self._cancelled = self._manager.dict()
+        self._progress = context.Queue()
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                             initargs=(self._progress, self._cancelled))
+        self._jobs = {}
+        self._futures = {}
+        # Jobs whose owner has no further use for them; dropped as soon as they finish
+        self._discarded = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {'submitted': 0, 'rejected': 0, 'done': 0, 'failed': 0, 'cancelled': 0}
+        self._listener = threading.Thread(target=self._listen, name='job-progress', daemon=True)
+        self._listener.start()
+
+    def warm_up(self):
+        # Start every worker (and load its models) before the first real job arrives
+        return [self._executor.submit(_ping) for _ in range(self.workers)]
+
+    def _active(self):
+        return sum(1 for job in self._jobs.values() if job['status'] not in FINISHED)
+
+    def _expire(self, now):
+        for job_id in [k for k, job in self._jobs.items()
+                       if job['status'] in FINISHED and now - job['finished'] > self.retention]:
+            del self._jobs[job_id]
+            self._cancelled.pop(job_id, None)
+
+    def submit(self, data, name=None, **options):
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            if self._closed:
+                raise Exception("Job queue is shut down")
+            self._expire(now)
+            if self._active() >= self.max_active:
+                self.stats['rejected'] += 1
+                raise QueueFull(f"Too many analyses in progress ({self.max_active}); try again shortly")
+            self._jobs[job_id] = {'id': job_id, 'name': name, 'status': QUEUED, 'submitted': now,
+                                  'started': None, 'finished': None, 'worker': None, 'error': None,
+                                  'text': None, 'details': None, 'score': None, 'prediction': None}
+            self.stats['submitted'] += 1
+            future = self._executor.submit(_run_job, job_id, bytes(data), name, options)
+            self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+        return job_id
+
+    def _finish(self, job_id, future):
+        with self._lock:
+            self._futures.pop(job_id, None)
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            try:
+                job.update(future.result())
+                job['status'] = DONE
+            except (CancelledError, JobCancelled):
+                job['status'] = CANCELLED
+            except Exception as e:
+                job['status'] = FAILED
+                job['error'] = str(e)
+            job['finished'] = time.time()
+            self.stats[job['status']] += 1
+            if job_id in self._discarded:
+                self._discarded.discard(job_id)
+                del self._jobs[job_id]
+                self._cancelled.pop(job_id, None)
+        instrumentation.count('resume_jobs_total', status=job['status'])
+        instrumentation.observe('resume_job_seconds', job['finished'] - job['submitted'], status=job['status'])
+
+    def _listen(self):
+        while True:
+            try:
+                message = self._progress.get(timeout=0.5)
+            except queue.Empty:
+                if self._closed:
+                    return
+                continue
+            except (EOFError, OSError):
+                return
+            job_id, stage, value = message
+            if stage == 'metrics':
+                instrumentation.merge(value)
+                continue
+            with self._lock:
+                job = self._jobs.get(job_id)
+                # Progress can arrive after the result; never move a finished job backwards
+                if job is None or job['status'] in FINISHED:
+                    continue
+                if stage == 'started':
+                    job['status'] = RUNNING
+                    job['started'] = time.time()
+                    job['worker'] = value
+                else:
+                    job[stage] = value
+
+    def status(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return copy.deepcopy(job) if job is not None else None
+
+    def cancel(self, job_id):
+        # Queued jobs never start; running jobs stop at their next stage boundary
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] in FINISHED:
+                return False
+            future = self._futures.get(job_id)
+            self._cancelled[job_id] = True
+        if future is not None:
+            future.cancel()
+        return True
+
+    def wait(self, job_id, timeout=None, interval=0.05):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.status(job_id)
+            if job is None or job['status'] in FINISHED:
+                return job
+            if deadline is not None and time.monotonic() > deadline:
+                return job
+            time.sleep(interval)
+
+    async def wait_async(self, job_id):
+        # For asyncio servers: resolves once the job has finished without blocking the loop
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            await asyncio.wait({asyncio.wrap_future(future)})
+        return self.status(job_id)
+
+    def discard(self, job_id):
+        # Forget a job once its result has been read (e.g. by the HTTP service) instead of
+        # holding its text and details for the retention period; unfinished jobs are
+        # dropped when they finish
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            if job['status'] in FINISHED:
+                del self._jobs[job_id]
+                self._cancelled.pop(job_id, None)
+            else:
+                self._discarded.add(job_id)
+
+    def metrics(self):
+        with self._lock:
+            metrics = dict(self.stats)
+            metrics['active'] = self._active()
+        metrics['workers'] = self.workers
+        metrics['max_active'] = self.max_active
+        return metrics
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            self._closed = True
+            for job_id in list(self._futures):
+                self._cancelled[job_id] = True
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._listener.join(2)
+        self._manager.shutdown()
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue()
+                _queue.warm_up()
+                atexit.register(_queue.shutdown, wait=False)
+    return _queue
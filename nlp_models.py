@@ -0,0 +1,55 @@
+# Process-wide registry of spaCy pipelines
+# Each pipeline is loaded once per process on first use and shared by every parser.
+
+import os
+import threading
+import spacy
+
+DEFAULT_MODEL = 'en_core_web_sm'
+CUSTOM_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'custom_nlp_model')
+
+_models = {}
+_missing = set()
+_lock = threading.Lock()
+
+
+def get_model(name=DEFAULT_MODEL):
+    model = _models.get(name)
+    if model is not None:
+        return model
+    with _lock:
+        # Another thread may have finished loading while we waited for the lock
+        model = _models.get(name)
+        if model is None:
+            try:
+                model = spacy.load(name)
+            except Exception as e:
+                raise Exception(f"Error loading spacy model: {str(e)}")
+            _models[name] = model
+    return model
+
+
+def get_custom_model():
+    if CUSTOM_MODEL_PATH in _models:
+        return _models[CUSTOM_MODEL_PATH]
+    if CUSTOM_MODEL_PATH in _missing or not os.path.exists(CUSTOM_MODEL_PATH):
+        return None
+    try:
+        return get_model(CUSTOM_MODEL_PATH)
+    except Exception as e:
+        # Remember the failure so every resume doesn't retry (and re-warn about) the load
+        with _lock:
+            _missing.add(CUSTOM_MODEL_PATH)
+        print(f"Warning: Could not load custom NLP model: {str(e)}")
+        return None
+
+
+def warm_up(names=(DEFAULT_MODEL,), custom=True):
+    for name in names:
+        get_model(name)
+    if custom:
+        get_custom_model()
+
+
+def loaded_models():
+    return list(_models)
@@ -0,0 +1,122 @@
+# Single-pass PDF ingestion
+# Walks a PDF once with pdfminer and keeps everything downstream code needs from it.
+# Pages are streamed, so callers can stop early or cap how much text reaches the NLP stage.
+
+import io
+import os
+import instrumentation
+from pdfminer3.layout import LAParams
+from pdfminer3.pdfpage import PDFPage
+from pdfminer3.pdfinterp import PDFResourceManager, PDFPageInterpreter
+from pdfminer3.converter import TextConverter
+
+
+class ResumeDocument:
+    def __init__(self, pages, name=None, page_count=None, truncated=False):
+        self.name = name
+        self.pages = pages
+        # page_count covers the whole PDF even when only the first pages were extracted
+        self.page_count = len(pages) if page_count is None else page_count
+        self.truncated = truncated
+        self.text_raw = ''.join(pages)
+        self.text = ' '.join(self.text_raw.split())
+
+    @property
+    def ext(self):
+        if self.name:
+            return os.path.splitext(self.name)[1].lstrip('.').lower() or 'pdf'
+        return 'pdf'
+
+
+def _open_source(source):
+    # Returns (file object, should_close, name)
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source), True, None
+    if isinstance(source, io.BytesIO):
+        source.seek(0)
+        return source, False, getattr(source, 'name', None)
+    return open(source, 'rb'), True, os.path.basename(source)
+
+
+class PageStream:
+    def __init__(self, source):
+        self._file, self._should_close, self.name = _open_source(source)
+        self._pages = PDFPage.get_pages(self._file, caching=True, check_extractable=True)
+        resource_manager = PDFResourceManager()
+        self._buffer = io.StringIO()
+        self._converter = TextConverter(resource_manager, self._buffer, laparams=LAParams())
+        self._interpreter = PDFPageInterpreter(resource_manager, self._converter)
+        self.pages_read = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        page = next(self._pages)
+        self._interpreter.process_page(page)
+        # Hand the page out and reset the buffer so memory tracks one page, not the document
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate(0)
+        self.pages_read += 1
+        return text
+
+    def count_remaining(self):
+        # Walks the page tree without layout analysis, which is where the cost is
+        return sum(1 for _ in self._pages)
+
+    def has_remaining(self):
+        # Like count_remaining, but stops at the first unread page
+        return next(self._pages, None) is not None
+
+    def close(self):
+        self._converter.close()
+        self._buffer.close()
+        if self._should_close:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_pages(source):
+    with PageStream(source) as stream:
+        yield from stream
+
+
+def load_document(source, name=None, max_pages=None, max_chars=None, stop_when=None, count_pages=True):
+    # stop_when(page_text) is called after every page; returning True ends extraction there
+    try:
+        with PageStream(source) as stream:
+            pages = []
+            chars = 0
+            cut = False
+            stopped = False
+            for text in stream:
+                if max_chars is not None and chars + len(text) > max_chars:
+                    text = text[:max_chars - chars]
+                    cut = True
+                pages.append(text)
+                chars += len(text)
+                if cut or (max_pages is not None and len(pages) >= max_pages) or (stop_when and stop_when(text)):
+                    stopped = True
+                    break
+
+            page_count = None
+            truncated = False
+            if stopped:
+                # Stopping on the last page leaves nothing unread, so that document is complete
+                with instrumentation.stage('pages'):
+                    if count_pages:
+                        remaining = stream.count_remaining()
+                        page_count = len(pages) + remaining
+                    else:
+                        remaining = stream.has_remaining()
+                truncated = cut or remaining > 0
+            source_name = stream.name
+    except Exception as e:
+        raise Exception(f"Error extracting text: {str(e)}")
+    return ResumeDocument(pages, name=name or source_name, page_count=page_count, truncated=truncated)
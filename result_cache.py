@@ -0,0 +1,192 @@
+# Content-hash cache for parsed resumes
+# Entries are keyed by the PDF bytes plus the parser version (models, skills list, regex),
+# so changing any of those makes old entries unreachable instead of stale.
+
+import os
+import copy
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+import nlp_models
+import instrumentation
+from pdf_ingest import ResumeDocument
+from resume_parser import (ResumeParser, DEFAULT_MAX_PAGES, DEFAULT_MAX_CHARS, load_for_fields, resolve_fields,
+                           spacy_components, uses_custom_model)
+from skill_index import load_skill_index
+from degree_matcher import load_degree_index
+
+DEFAULT_MEMORY_ENTRIES = int(os.environ.get('RESUME_CACHE_SIZE', '256'))
+DEFAULT_DISK_DIR = os.environ.get('RESUME_CACHE_DIR') or None
+DEFAULT_DISK_BYTES = int(os.environ.get('RESUME_CACHE_DISK_BYTES', str(256 * 1024 * 1024)))
+
+def parser_version(skills_file=None, custom_regex=None, fields=None, max_pages=None, max_chars=None, full_text=False):
+    fields = resolve_fields(fields)
+    max_pages = DEFAULT_MAX_PAGES if max_pages is None else max_pages
+    max_chars = DEFAULT_MAX_CHARS if max_chars is None else max_chars
+    # A contact-only entry may hold just the first page, so it never stands in for a full read
+    parts = [f"fields={','.join(fields)}", f"budget={max_pages}/{max_chars}", f"full_text={bool(full_text)}"]
+    models = []
+    if spacy_components(fields):
+        models.append(nlp_models.get_model())
+    if uses_custom_model(fields):
+        models.append(nlp_models.get_custom_model())
+    for model in models:
+        if model is not None:
+            parts.append(f"{model.meta.get('name', '')}={model.meta.get('version', '')}")
+    parts.append(f"skills={load_skill_index(skills_file).version}")
+    if 'degree' in fields or 'certifications' in fields:
+        parts.append(f"degrees={load_degree_index().version}")
+    if custom_regex:
+        parts.append(f"regex={custom_regex}")
+    return '|'.join(parts)
+
+
+def cache_key(data, version):
+    h = hashlib.sha256()
+    h.update(version.encode('utf-8'))
+    h.update(b'\0')
+    h.update(data)
+    return h.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, max_entries=DEFAULT_MEMORY_ENTRIES, disk_dir=DEFAULT_DISK_DIR, max_disk_bytes=DEFAULT_DISK_BYTES):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'disk_evictions': 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                self.stats['memory_hits'] += 1
+                instrumentation.count('resume_cache_lookups_total', result='memory_hit')
+                return entry
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                os.utime(path)
+            except (OSError, ValueError):
+                entry = None
+            if entry is not None:
+                with self._lock:
+                    self._remember(key, entry)
+                    self.stats['hits'] += 1
+                    self.stats['disk_hits'] += 1
+                instrumentation.count('resume_cache_lookups_total', result='disk_hit')
+                return entry
+
+        with self._lock:
+            self.stats['misses'] += 1
+        instrumentation.count('resume_cache_lookups_total', result='miss')
+        return None
+
+    def put(self, key, entry):
+        with self._lock:
+            self._remember(key, entry)
+        if self.disk_dir:
+            try:
+                tmp_path = self._disk_path(key) + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f)
+                os.replace(tmp_path, self._disk_path(key))
+                self._evict_disk()
+            except OSError as e:
+                print(f"Warning: Could not write resume cache entry: {str(e)}")
+
+    def _evict_disk(self):
+        # Least recently used first; reads touch the file so mtime tracks use
+        files = []
+        total = 0
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.disk_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.stats['disk_evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.disk_dir:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def parse(self, data, name=None, skills_file=None, custom_regex=None, fields=None, max_pages=None, max_chars=None,
+              full_text=False, on_document=None):
+        # on_document(document) is called once the text is known, before the fields are extracted;
+        # full_text is for callers that score the document (see load_for_fields)
+        key = cache_key(data, parser_version(skills_file, custom_regex, fields, max_pages, max_chars, full_text))
+        entry = self.get(key)
+        hit = entry is not None
+        if not hit:
+            document = load_for_fields(bytes(data), fields, custom_regex, max_pages, max_chars, name=name,
+                                       full_text=full_text)
+            if on_document is not None:
+                on_document(document)
+            parser = ResumeParser(document, skills_file=skills_file, custom_regex=custom_regex, fields=fields)
+            entry = {'details': parser.get_extracted_data(), 'pages': document.pages, 'name': document.name,
+                     'page_count': document.page_count, 'truncated': document.truncated}
+            self.put(key, entry)
+        # Callers get their own copy so edits never leak into the cached entry
+        document = ResumeDocument(entry['pages'], name=name or entry.get('name'),
+                                  page_count=entry.get('page_count'), truncated=entry.get('truncated', False))
+        if on_document is not None and hit:
+            on_document(document)
+        return copy.deepcopy(entry['details']), document
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache():
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = ResultCache()
+    return _default_cache
+
+
+def parse_resume_cached(data, name=None, skills_file=None, custom_regex=None, fields=None, max_pages=None, max_chars=None,
+                        full_text=False):
+    return get_default_cache().parse(data, name=name, skills_file=skills_file, custom_regex=custom_regex,
+                                     fields=fields, max_pages=max_pages, max_chars=max_chars, full_text=full_text)
@@ -1,42 +1,20 @@
 import os
 import io
-import spacy
 from spacy.matcher import Matcher
 import re
 import PyPDF2
-from pdfminer3.layout import LAParams
-from pdfminer3.pdfpage import PDFPage
-from pdfminer3.pdfinterp import PDFResourceManager, PDFPageInterpreter
-from pdfminer3.converter import TextConverter
+import nlp_models
+import instrumentation
+from pdf_ingest import ResumeDocument, load_document
+from skill_index import load_skill_index
+from contact_scanner import get_scanner
+from degree_matcher import load_degree_index
 
 # Placeholder utils module
 class utils:
     @staticmethod
     def extract_text(file, ext):
-        try:
-            resource_manager = PDFResourceManager()
-            fake_file_handle = io.StringIO()
-            converter = TextConverter(resource_manager, fake_file_handle, laparams=LAParams())
-            page_interpreter = PDFPageInterpreter(resource_manager, converter)
-
-            if isinstance(file, io.BytesIO):
-                file.seek(0)
-                file_obj = file
-            else:
-                file_obj = open(file, 'rb')
-
-            for page in PDFPage.get_pages(file_obj, caching=True, check_extractable=True):
-                page_interpreter.process_page(page)
-            text = fake_file_handle.getvalue()
-
-            converter.close()
-            fake_file_handle.close()
-            if not isinstance(file, io.BytesIO):
-                file_obj.close()
-
-            return text
-        except Exception as e:
-            raise Exception(f"Error extracting text: {str(e)}")
+        return load_document(file).text_raw
 
     @staticmethod
     def extract_entities_with_custom_model(doc):
@@ -69,35 +47,21 @@ class utils:
 
     @staticmethod
     def extract_email(text):
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        emails = re.findall(email_pattern, text)
-        return emails[0] if emails else None
+        return get_scanner().first(text, 'email')
 
     @staticmethod
     def extract_mobile_number(text, custom_regex=None):
-        if custom_regex:
-            pattern = custom_regex
-        else:
-            pattern = r'(\+\d{1,3}\s?)?(\d{10}|\(\d{3}\)\s?\d{3}-\d{4}|\d{3}-\d{3}-\d{4})'
-        numbers = re.findall(pattern, text)
-        return numbers[0][-1] if numbers else None
+        # Normalised, with the country code when the resume gives one ("+919876543210")
+        return get_scanner(custom_regex).first(text, 'phone')
 
     @staticmethod
-    def extract_skills(doc, noun_chunks, skills_file=None):
-        if skills_file and os.path.exists(skills_file):
-            with open(skills_file, 'r') as f:
-                skills_list = [line.strip().lower() for line in f if line.strip()]
-        else:
-            skills_list = ['python', 'java', 'javascript', 'sql', 'machine learning', 'tensorflow', 'react', 'django', 'flutter', 'swift', 'figma']
+    def extract_links(text):
+        # {'linkedin': [...], 'github': [...], 'portfolio': [...]}
+        return get_scanner().links(text)
 
-        skills = []
-        for token in doc:
-            if token.text.lower() in skills_list:
-                skills.append(token.text)
-        for chunk in noun_chunks:
-            if chunk.text.lower() in skills_list:
-                skills.append(chunk.text)
-        return list(set(skills))
+    @staticmethod
+    def extract_skills(text, skills_file=None):
+        return load_skill_index(skills_file).extract(text)
 
     @staticmethod
     def get_number_of_pages(file):
@@ -113,45 +77,132 @@ class utils:
 
     @staticmethod
     def extract_degrees(text):
-        degree_keywords = [
-            "Bachelor", "B.Tech", "BE", "BSc", "BCA",
-            "Master", "M.Tech", "ME", "MSc", "MCA",
-            "PhD", "Doctorate", "Diploma", "BA", "MA"
-        ]
-        found = [deg for deg in degree_keywords if deg.lower() in text.lower()]
-        return list(set(found))
+        # Canonical names in order of appearance, e.g. "B.Tech" -> "Bachelor of Technology"
+        return load_degree_index().extract(text)
+
+    @staticmethod
+    def extract_certifications(text):
+        return load_degree_index().extract(text, ('certification',))
+
+
+FIELDS = ('name', 'email', 'mobile_number', 'skills', 'degree', 'no_of_pages')
+# Only extracted when asked for by name
+OPTIONAL_FIELDS = ('links', 'certifications')
+ALL_FIELDS = FIELDS + OPTIONAL_FIELDS
+
+# spaCy components each field needs; fields missing here are regex/index/document only
+FIELD_COMPONENTS = {
+    'name': ('ner',),
+}
+CUSTOM_MODEL_FIELDS = ('name', 'degree')
+
+
+def resolve_fields(fields=None):
+    if fields is None:
+        return FIELDS
+    unknown = [f for f in fields if f not in ALL_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown resume fields: {', '.join(unknown)}. Choose from {', '.join(ALL_FIELDS)}.")
+    return tuple(f for f in ALL_FIELDS if f in fields)
+
+
+def spacy_components(fields):
+    components = []
+    for field in fields:
+        for component in FIELD_COMPONENTS.get(field, ()):
+            if component not in components:
+                components.append(component)
+    return components
+
+
+def disabled_pipes(nlp, fields):
+    components = spacy_components(fields)
+    return [name for name in nlp.pipe_names if name not in components]
+
+
+def uses_custom_model(fields):
+    return any(f in CUSTOM_MODEL_FIELDS for f in fields)
+
+
+# Page/character budgets applied when the caller doesn't pass its own (unset = whole document)
+DEFAULT_MAX_PAGES = int(os.environ['RESUME_MAX_PAGES']) if os.environ.get('RESUME_MAX_PAGES') else None
+DEFAULT_MAX_CHARS = int(os.environ['RESUME_MAX_CHARS']) if os.environ.get('RESUME_MAX_CHARS') else None
+
+
+def early_stop_predicate(fields, custom_regex=None):
+    # Contact details live on the first page almost always; anything else needs the full text
+    # (including links, which are all collected). The page count doesn't: load_document counts
+    # the unread pages from the page tree
+    kinds = {'name': None, 'email': 'email', 'mobile_number': 'phone', 'no_of_pages': None}
+    if any(f not in kinds for f in fields):
+        return None
+    scanner = get_scanner(custom_regex)
+    missing = {kinds[f] for f in fields if kinds[f]}
+
+    def stop_when(page_text):
+        if missing:
+            for match in scanner.scan(' '.join(page_text.split()), missing, first_only=True):
+                missing.discard(match.kind)
+        return not missing
+    return stop_when
+
+
+def _source_bytes(source):
+    if isinstance(source, io.BytesIO):
+        return source.getbuffer().nbytes
+    if isinstance(source, (bytes, bytearray)):
+        return len(source)
+    try:
+        return os.path.getsize(source)
+    except (OSError, TypeError):
+        return None
+
+
+def load_for_fields(source, fields=None, custom_regex=None, max_pages=None, max_chars=None, name=None,
+                    full_text=False):
+    # full_text: the caller also scores the whole document, so never stop after the contact details,
+    # and count the pages a budget leaves unread
+    fields = resolve_fields(fields)
+    with instrumentation.stage('extract') as timer:
+        document = load_document(source, name=name,
+                                 max_pages=DEFAULT_MAX_PAGES if max_pages is None else max_pages,
+                                 max_chars=DEFAULT_MAX_CHARS if max_chars is None else max_chars,
+                                 stop_when=None if full_text else early_stop_predicate(fields, custom_regex),
+                                 count_pages=full_text or 'no_of_pages' in fields)
+        timer.set(pages=document.page_count, chars=len(document.text_raw), truncated=document.truncated)
+    if instrumentation.enabled():
+        instrumentation.count('resume_documents_total', truncated=str(document.truncated).lower())
+        instrumentation.observe('resume_document_pages', document.page_count)
+        instrumentation.observe('resume_document_chars', len(document.text_raw))
+        size = _source_bytes(source)
+        if size is not None:
+            instrumentation.observe('resume_document_bytes', size)
+    return document
 
 
 class ResumeParser:
-    def __init__(self, resume, skills_file=None, custom_regex=None):
-        try:
-            self.nlp = spacy.load('en_core_web_sm')
-        except Exception as e:
-            raise Exception(f"Error loading spacy model: {str(e)}")
+    def __init__(self, resume, skills_file=None, custom_regex=None, doc=None, custom_doc=None, fields=None,
+                 max_pages=None, max_chars=None):
+        self.fields = resolve_fields(fields)
 
-        self.custom_nlp = None
-        try:
-            custom_model_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'custom_nlp_model')
-            if os.path.exists(custom_model_path):
-                self.custom_nlp = spacy.load(custom_model_path)
-        except Exception as e:
-            print(f"Warning: Could not load custom NLP model: {str(e)}")
+        # Models come from the shared registry so only the first resume pays the load cost,
+        # and only the models the requested fields need are touched at all
+        self.nlp = nlp_models.get_model() if spacy_components(self.fields) else None
+        self.custom_nlp = nlp_models.get_custom_model() if uses_custom_model(self.fields) else None
 
-        self.matcher = Matcher(self.nlp.vocab)
+        self.matcher = Matcher(self.nlp.vocab) if self.nlp else None
         self.skills_file = skills_file
         self.custom_regex = custom_regex
         self.resume = resume
 
-        self.details = {
-            'name': None,
-            'email': None,
-            'mobile_number': None,
-            'skills': None,
-            'degree': None,
-            'no_of_pages': None,
-        }
+        self.details = {field: None for field in self.fields}
 
-        if not isinstance(resume, io.BytesIO):
+        if isinstance(resume, ResumeDocument):
+            self.ext = resume.ext
+        elif isinstance(resume, (bytes, bytearray)):
+            # Raw uploads have no file name; load_document checks they really are PDFs
+            self.ext = 'pdf'
+        elif not isinstance(resume, io.BytesIO):
             self.ext = os.path.splitext(resume)[1].lstrip('.').lower()
         else:
             self.ext = resume.name.split('.')[-1].lower() if hasattr(resume, 'name') else 'pdf'
@@ -159,15 +210,32 @@ class ResumeParser:
         if self.ext not in ['pdf']:
             raise ValueError(f"Unsupported file format: {self.ext}. Only PDF is supported.")
 
-        try:
-            self.text_raw = utils.extract_text(self.resume, f'.{self.ext}')
-            self.text = ' '.join(self.text_raw.split())
-        except Exception as e:
-            raise Exception(f"Failed to extract text from resume: {str(e)}")
+        # The PDF is walked once; text and page count both come from the same document
+        if isinstance(resume, ResumeDocument):
+            self.document = resume
+        else:
+            try:
+                self.document = load_for_fields(self.resume, self.fields, custom_regex, max_pages, max_chars)
+            except Exception as e:
+                raise Exception(f"Failed to extract text from resume: {str(e)}")
+        self.text_raw = self.document.text_raw
+        self.text = self.document.text
 
-        self.doc = self.nlp(self.text)
-        self.custom_doc = self.custom_nlp(self.text_raw) if self.custom_nlp else self.doc
-        self.noun_chunks = list(self.doc.noun_chunks)
+        # Batch callers run nlp.pipe themselves and hand in the finished docs
+        if doc is not None:
+            self.doc = doc
+        elif self.nlp is not None:
+            with instrumentation.stage('nlp', chars=len(self.text)):
+                self.doc = self.nlp(self.text, disable=disabled_pipes(self.nlp, self.fields))
+        else:
+            self.doc = None
+        if custom_doc is not None:
+            self.custom_doc = custom_doc
+        elif self.custom_nlp:
+            with instrumentation.stage('custom_nlp', chars=len(self.text_raw)):
+                self.custom_doc = self.custom_nlp(self.text_raw)
+        else:
+            self.custom_doc = self.doc
         self._extract_basic_details()
 
     def get_extracted_data(self):
@@ -175,32 +243,65 @@ class ResumeParser:
 
     def _extract_basic_details(self):
         try:
-            custom_entities = utils.extract_entities_with_custom_model(self.custom_doc)
-            name = utils.extract_name(self.doc, text=self.text_raw)
-            try:
-                self.details['name'] = custom_entities['Name'][0] if custom_entities['Name'] else name
-            except (KeyError, IndexError):
-                self.details['name'] = name
+            fields = self.fields
+            if self.custom_doc is not None and uses_custom_model(fields):
+                custom_entities = utils.extract_entities_with_custom_model(self.custom_doc)
+            else:
+                custom_entities = {'Name': [], 'Degree': []}
 
-            self.details['email'] = utils.extract_email(self.text)
-            self.details['mobile_number'] = utils.extract_mobile_number(self.text, self.custom_regex)
-            self.details['skills'] = utils.extract_skills(self.doc, self.noun_chunks, self.skills_file)
-            self.details['no_of_pages'] = utils.get_number_of_pages(self.resume)
+            if 'name' in fields:
+                name = utils.extract_name(self.doc, text=self.text_raw)
+                try:
+                    self.details['name'] = custom_entities['Name'][0] if custom_entities['Name'] else name
+                except (KeyError, IndexError):
+                    self.details['name'] = name
 
-            try:
-                if custom_entities['Degree']:
+            # Email, phone and links come from one pass of the contact scanner
+            kinds = [kind for field, kind in (('email', 'email'), ('mobile_number', 'phone')) if field in fields]
+            if 'links' in fields:
+                kinds += ['linkedin', 'github', 'portfolio']
+            if kinds:
+                contacts = get_scanner(self.custom_regex).scan(self.text, kinds, first_only='links' not in fields)
+                firsts = {}
+                for match in contacts:
+                    firsts.setdefault(match.kind, match.value)
+                if 'email' in fields:
+                    self.details['email'] = firsts.get('email')
+                if 'mobile_number' in fields:
+                    self.details['mobile_number'] = firsts.get('phone')
+                if 'links' in fields:
+                    links = {'linkedin': [], 'github': [], 'portfolio': []}
+                    for match in contacts:
+                        if match.kind in links and match.value not in links[match.kind]:
+                            links[match.kind].append(match.value)
+                    self.details['links'] = links
+            if 'skills' in fields:
+                with instrumentation.stage('skills') as timer:
+                    self.skill_matches = load_skill_index(self.skills_file).match(self.text)
+                    self.details['skills'] = list(dict.fromkeys(m.name for m in self.skill_matches))
+                    timer.set(skills=len(self.details['skills']))
+            if 'no_of_pages' in fields:
+                self.details['no_of_pages'] = self.document.page_count
+
+            # Degrees and certifications come from one pass of the taxonomy index
+            if 'degree' in fields or 'certifications' in fields:
+                self.degree_matches = load_degree_index().match(self.text)
+            if 'degree' in fields:
+                if custom_entities.get('Degree'):
                     self.details['degree'] = custom_entities['Degree']
                 else:
-                    self.details['degree'] = utils.extract_degrees(self.text)
-            except KeyError:
-                self.details['degree'] = utils.extract_degrees(self.text)
+                    self.details['degree'] = list(dict.fromkeys(m.name for m in self.degree_matches
+                                                                if m.type == 'degree'))
+            if 'certifications' in fields:
+                self.details['certifications'] = list(dict.fromkeys(m.name for m in self.degree_matches
+                                                                    if m.type == 'certification'))
         except Exception as e:
             raise Exception(f"Error extracting details: {str(e)}")
 
 
-def parse_resume(resume):
+def parse_resume(resume, fields=None, max_pages=None, max_chars=None):
     try:
-        parser = ResumeParser(resume)
+        parser = ResumeParser(resume, fields=fields, max_pages=max_pages, max_chars=max_chars)
         return parser.get_extracted_data()
     except Exception as e:
         return {'error': str(e)}
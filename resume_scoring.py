@@ -0,0 +1,75 @@
+# Resume section detection and scoring
+# All section headings are compiled into one case-insensitive pattern, so the resume
+# text is scanned once no matter how many sections are scored.
+
+import re
+import instrumentation
+
+# (section name, heading keywords, weight) - weights add up to 100
+SECTIONS = [
+    ("Objective or Summary", ["OBJECTIVE", "SUMMARY"], 6),
+    ("Education", ["EDUCATION", "SCHOOL", "COLLEGE"], 12),
+    ("Experience", ["EXPERIENCE", "WORK EXPERIENCE"], 16),
+    ("Internships", ["INTERNSHIP", "INTERNSHIPS"], 6),
+    ("Skills", ["SKILL", "SKILLS"], 7),
+    ("Hobbies", ["HOBBIES"], 4),
+    ("Interests", ["INTERESTS"], 5),
+    ("Achievements", ["ACHIEVEMENTS"], 13),
+    ("Certifications", ["CERTIFICATION", "CERTIFICATIONS"], 12),
+    ("Projects", ["PROJECT", "PROJECTS"], 19),
+]
+
+# Checked in order; the first section present decides the level
+LEVELS = [
+    ("Internships", "Intermediate"),
+    ("Experience", "Experienced"),
+]
+DEFAULT_LEVEL = "Fresher"
+
+
+class ResumeScorer:
+    def __init__(self, sections=SECTIONS, levels=LEVELS):
+        self.sections = [(name, list(keywords), weight) for name, keywords, weight in sections]
+        self.levels = list(levels)
+        self._section_for = {}
+        for name, keywords, _ in self.sections:
+            for keyword in keywords:
+                self._section_for.setdefault(keyword.upper(), name)
+        # Longest keywords first so "WORK EXPERIENCE" wins over "EXPERIENCE" at the same offset
+        alternatives = sorted(self._section_for, key=len, reverse=True)
+        self._pattern = re.compile('|'.join(re.escape(k) for k in alternatives), re.IGNORECASE)
+
+    def find_sections(self, text):
+        spans = {}
+        for match in self._pattern.finditer(text or ''):
+            name = self._section_for[match.group().upper()]
+            spans.setdefault(name, []).append((match.start(), match.end()))
+        return spans
+
+    def score(self, text, page_count=None, weights=None):
+        spans = self.find_sections(text)
+        weights = weights or {}
+        breakdown = []
+        total = 0
+        for name, _, weight in self.sections:
+            weight = weights.get(name, weight)
+            found = name in spans
+            if found:
+                total += weight
+            breakdown.append({'section': name, 'weight': weight, 'found': found, 'spans': spans.get(name, [])})
+
+        level = DEFAULT_LEVEL
+        if page_count is None or page_count >= 1:
+            for section, candidate_level in self.levels:
+                if section in spans:
+                    level = candidate_level
+                    break
+        return {'score': total, 'sections': breakdown, 'level': level}
+
+
+_default_scorer = ResumeScorer()
+
+
+def score_resume(text, page_count=None, weights=None):
+    with instrumentation.stage('score'):
+        return _default_scorer.score(text, page_count=page_count, weights=weights)
@@ -0,0 +1,207 @@
+# Headless resume parsing service
+# Serves the parser over HTTP so other services share one warm worker pool instead of each
+# loading spaCy. Parsing runs in the jobs.py worker processes; the tornado event loop only
+# moves bytes and JSON.
+#
+#   POST /parse    one PDF, as the raw request body or a multipart "resume" file
+#   POST /batch    multipart form with any number of PDF files
+#   GET  /health   worker pool status
+#   GET  /metrics  Prometheus text metrics (with RESUME_METRICS=1)
+#
+# Both parse endpoints accept ?fields=name,email&max_pages=2&max_chars=20000.
+#
+# Usage:
+#   python service.py --port 8600 --workers 4 --concurrency 16
+
+import os
+import sys
+import asyncio
+import argparse
+import datetime
+from tornado import web, httpserver, locks, gen
+import jobs
+from file_server import MetricsHandler
+from resume_parser import ALL_FIELDS
+
+DEFAULT_PORT = int(os.environ.get('RESUME_SERVICE_PORT', '8600'))
+DEFAULT_CONCURRENCY = int(os.environ.get('RESUME_SERVICE_CONCURRENCY', '16'))
+DEFAULT_MAX_BATCH = int(os.environ.get('RESUME_SERVICE_MAX_BATCH', '50'))
+DEFAULT_MAX_BODY = int(os.environ.get('RESUME_SERVICE_MAX_BODY', str(50 * 1024 * 1024)))
+ADMISSION_TIMEOUT = 5.0
+IDLE_TIMEOUT = 75
+
+
+def job_record(job):
+    # Same shape as the bulk_parse.py JSONL records, plus the per-section breakdown
+    if job['status'] != jobs.DONE:
+        error = job['error'] or f"Analysis {job['status']}"
+        return {'file': job['name'], 'details': None, 'error': error}
+    if job['text']['truncated']:
+        # Page/character budgets left part of the resume unread; a score of the rest would look real
+        return {'file': job['name'], 'details': job['details'], 'score': None, 'level': None, 'sections': None,
+                'field': None, 'error': None}
+    score = job['score']
+    prediction = job['prediction']
+    return {'file': job['name'], 'details': job['details'], 'score': score['score'], 'level': score['level'],
+            'sections': [{'section': s['section'], 'found': s['found']} for s in score['sections']],
+            'field': prediction['field'] if prediction else None, 'error': None}
+
+
+class BaseHandler(web.RequestHandler):
+    def initialize(self, job_queue, admission, max_batch):
+        self.job_queue = job_queue
+        self.admission = admission
+        self.max_batch = max_batch
+        self.pending = []
+
+    def write_error(self, status_code, **kwargs):
+        message = self._reason
+        if 'exc_info' in kwargs and isinstance(kwargs['exc_info'][1], web.HTTPError):
+            message = kwargs['exc_info'][1].log_message or message
+        self.finish({'error': message})
+
+    def options_from_query(self):
+        options = {}
+        fields = self.get_query_argument('fields', None)
+        if fields:
+            options['fields'] = [f.strip() for f in fields.split(',') if f.strip()]
+            unknown = [f for f in options['fields'] if f not in ALL_FIELDS]
+            if unknown:
+                raise web.HTTPError(400, f"Unknown fields: {', '.join(unknown)}")
+        for name in ('max_pages', 'max_chars'):
+            value = self.get_query_argument(name, None)
+            if value is not None:
+                try:
+                    options[name] = int(value)
+                except ValueError:
+                    raise web.HTTPError(400, f"{name} must be an integer")
+        return options
+
+    def submit(self, data, name, options):
+        try:
+            job_id = self.job_queue.submit(data, name=name, **options)
+        except jobs.QueueFull as e:
+            self.set_header('Retry-After', '1')
+            raise web.HTTPError(503, str(e))
+        self.pending.append(job_id)
+        return job_id
+
+    async def admit(self):
+        # Requests beyond the concurrency limit wait briefly for a slot, then get 503
+        try:
+            await self.admission.acquire(timeout=datetime.timedelta(seconds=ADMISSION_TIMEOUT))
+        except gen.TimeoutError:
+            self.set_header('Retry-After', '1')
+            raise web.HTTPError(503, "Server busy; try again shortly")
+
+    def on_connection_close(self):
+        # The client went away; don't keep workers busy on its behalf
+        for job_id in self.pending:
+            self.job_queue.cancel(job_id)
+
+    def on_finish(self):
+        # Results have been sent (or the client is gone); the queue doesn't need to keep them
+        for job_id in self.pending:
+            self.job_queue.discard(job_id)
+
+
+class ParseHandler(BaseHandler):
+    async def post(self):
+        options = self.options_from_query()
+        files = self.request.files.get('resume')
+        if files:
+            data, name = files[0].body, files[0].filename
+        else:
+            data, name = self.request.body, self.get_query_argument('name', None)
+        if not data:
+            raise web.HTTPError(400, "Send a PDF as the request body or as a multipart 'resume' file")
+
+        await self.admit()
+        try:
+            job_id = self.submit(data, name, options)
+            job = await self.job_queue.wait_async(job_id)
+        finally:
+            self.admission.release()
+        record = job_record(job)
+        if record['error']:
+            self.set_status(422)
+        self.finish(record)
+
+
+class BatchHandler(BaseHandler):
+    async def post(self):
+        options = self.options_from_query()
+        files = [f for group in self.request.files.values() for f in group]
+        if not files:
+            raise web.HTTPError(400, "Send PDFs as multipart files")
+        if len(files) > self.max_batch:
+            raise web.HTTPError(413, f"At most {self.max_batch} files per batch")
+
+        await self.admit()
+        try:
+            job_ids = []
+            for f in files:
+                try:
+                    job_ids.append(self.submit(f.body, f.filename, options))
+                except web.HTTPError:
+                    # Queue filled part-way through: give back what was queued
+                    for job_id in job_ids:
+                        self.job_queue.cancel(job_id)
+                    raise
+            results = await asyncio.gather(*[self.job_queue.wait_async(job_id) for job_id in job_ids])
+        finally:
+            self.admission.release()
+        records = [job_record(job) for job in results]
+        self.finish({'results': records, 'parsed': sum(1 for r in records if not r['error']),
+                     'errors': sum(1 for r in records if r['error'])})
+
+
+class HealthHandler(BaseHandler):
+    def get(self):
+        self.finish({'status': 'ok', 'jobs': self.job_queue.metrics()})
+
+
+def make_app(job_queue, concurrency=DEFAULT_CONCURRENCY, max_batch=DEFAULT_MAX_BATCH):
+    settings = {'job_queue': job_queue, 'admission': locks.Semaphore(concurrency), 'max_batch': max_batch}
+    return web.Application([
+        (r"/parse", ParseHandler, settings),
+        (r"/batch", BatchHandler, settings),
+        (r"/health", HealthHandler, settings),
+        (r"/metrics", MetricsHandler),
+    ])
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Serve the resume parser over HTTP.")
+    arg_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    arg_parser.add_argument('--address', default='127.0.0.1')
+    arg_parser.add_argument('--workers', '-w', type=int, default=jobs.DEFAULT_WORKERS, help="parser worker processes")
+    arg_parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                            help="requests parsed at once; more wait briefly, then get 503")
+    arg_parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH, help="files accepted per /batch request")
+    args = arg_parser.parse_args(argv)
+
+    async def serve():
+        job_queue = jobs.JobQueue(workers=args.workers, max_active=max(jobs.DEFAULT_MAX_ACTIVE, args.max_batch))
+        # Load the models in every worker before accepting traffic
+        await asyncio.gather(*[asyncio.wrap_future(f) for f in job_queue.warm_up()])
+        # HTTP/1.1 keep-alive is on by default; idle connections are closed after IDLE_TIMEOUT
+        server = httpserver.HTTPServer(make_app(job_queue, args.concurrency, args.max_batch),
+                                       max_body_size=DEFAULT_MAX_BODY, idle_connection_timeout=IDLE_TIMEOUT)
+        server.listen(args.port, args.address)
+        print(f"Resume parser listening on http://{args.address}:{args.port} with {args.workers} workers")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            server.stop()
+            job_queue.shutdown(wait=False)
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+# Compiled skill index
+# Skills and their aliases are compiled once per skills file into a token trie, so a
+# single pass over the text finds every (multi-word) skill regardless of taxonomy size.
+#
+# Skills file format: one skill per line, optional aliases separated by "|":
+#   javascript|js|ecmascript
+#   machine learning|ml
+
+import os
+import re
+import hashlib
+import threading
+from collections import namedtuple
+
+DEFAULT_SKILLS = ['python', 'java', 'javascript', 'sql', 'machine learning', 'tensorflow', 'react', 'django', 'flutter', 'swift', 'figma']
+
+# Keeps "node.js", "c++" and "c#" as single tokens. Hyphens split, as spaCy's tokenizer did, so
+# "Java-based" still finds java; "scikit-learn" is matched as the two tokens scikit, learn
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.+#]+[a-z0-9]+)*[+#]*", re.IGNORECASE)
+
+SkillMatch = namedtuple('SkillMatch', ['name', 'start', 'end'])
+
+_END = object()
+
+
+def tokenize(text):
+    return [(m.group().lower(), m.start(), m.end()) for m in TOKEN_RE.finditer(text)]
+
+
+class SkillIndex:
+    def __init__(self, entries):
+        self._trie = {}
+        self.size = 0
+        # The tokenizer is part of the version: changing it changes what cached parses would find
+        digest = hashlib.sha256(TOKEN_RE.pattern.encode('utf-8'))
+        for canonical, aliases in entries:
+            digest.update(f"{canonical}|{'|'.join(aliases)}\n".encode('utf-8'))
+            for phrase in [canonical] + list(aliases):
+                tokens = [t for t, _, _ in tokenize(phrase)]
+                if tokens:
+                    self._add(tokens, canonical)
+            self.size += 1
+        self.version = digest.hexdigest()[:16]
+
+    def _add(self, tokens, canonical):
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        # First definition wins when two skills share an alias
+        node.setdefault(_END, canonical)
+
+    @classmethod
+    def from_lines(cls, lines):
+        entries = []
+        for line in lines:
+            parts = [p.strip() for p in line.split('|') if p.strip()]
+            if parts:
+                entries.append((parts[0], parts[1:]))
+        return cls(entries)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_lines(f)
+
+    def match(self, text):
+        tokens = tokenize(text)
+        matches = []
+        i = 0
+        n = len(tokens)
+        while i < n:
+            # Longest match starting at token i
+            node = self._trie
+            best = None
+            j = i
+            while j < n:
+                node = node.get(tokens[j][0])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    best = (node[_END], j)
+            if best:
+                name, end = best
+                matches.append(SkillMatch(name, tokens[i][1], tokens[end - 1][2]))
+                i = end
+            else:
+                i += 1
+        return matches
+
+    def extract(self, text):
+        return list(dict.fromkeys(m.name for m in self.match(text)))
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def load_skill_index(skills_file=None):
+    if skills_file and os.path.exists(skills_file):
+        stat = os.stat(skills_file)
+        key = (os.path.abspath(skills_file), stat.st_mtime, stat.st_size)
+    else:
+        key = None
+
+    index = _indexes.get(key)
+    if index is None:
+        with _lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = SkillIndex.from_file(skills_file) if key else SkillIndex.from_lines(DEFAULT_SKILLS)
+                # Drop indexes compiled from older versions of the same file
+                for old in [k for k in _indexes if k and key and k[0] == key[0]]:
+                    del _indexes[old]
+                _indexes[key] = index
+    return index
@@ -0,0 +1,45 @@
+import pytest
+from degree_matcher import load_degree_index
+
+# Headers, addresses and ordinary prose must not turn into degrees
+NOT_DEGREES = [
+    "John Doe, Boston, MA 02115",
+    "Jackson, MS 39201 | john@example.com",
+    "Portland, ME 04101",
+    "FOLLOW ME ON GITHUB",
+    "ABOUT ME Passionate engineer",
+    "SUMMARY ME 2019",
+    "BE the change you want to see",
+    "I want to be a better engineer",
+    "Skills: MS Office, MS Excel",
+    "Scrum Master for two teams",
+    "Wanted to master React",
+    "Chess master",
+    "Master of Ceremonies at college fest",
+    "He is a master of disguise",
+    "Bachelor party organiser",
+]
+
+DEGREES = [
+    ("BE in Mechanical Engineering, 2016", ["Bachelor of Engineering"]),
+    ("ME (Thermal) 2019", ["Master of Engineering"]),
+    ("EDUCATION\nME Thermal Engineering 2019", ["Master of Engineering"]),
+    ("MA English, Delhi University", ["Master of Arts"]),
+    ("MS in Computer Science", ["Master of Science"]),
+    ("M.A. from Pune", ["Master of Arts"]),
+    ("B.Tech, B. Tech, BTech and Bachelor's of Technology", ["Bachelor of Technology"]),
+    ("Master in Data Science", ["Master's Degree"]),
+    ("Masters, University of Pune, 2015", ["Master's Degree"]),
+    ("Bachelor in Computer Science", ["Bachelor's Degree"]),
+    ("Master's Degree", ["Master's Degree"]),
+]
+
+
+@pytest.mark.parametrize("text", NOT_DEGREES)
+def test_not_a_degree(text):
+    assert load_degree_index().extract(text) == []
+
+
+@pytest.mark.parametrize("text,expected", DEGREES)
+def test_degree(text, expected):
+    assert load_degree_index().extract(text) == expected
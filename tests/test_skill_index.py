@@ -0,0 +1,19 @@
+import pytest
+from skill_index import SkillIndex, load_skill_index
+
+SKILLS = ['python', 'java', 'javascript|js', 'node.js|nodejs', 'c++', 'c#', 'scikit-learn', 'machine learning|ml']
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("Built Java-based services", ['java']),
+    ("Python-based tooling", ['python']),
+    ("Wrote Node.js and C++ services, some C#", ['node.js', 'c++', 'c#']),
+    ("Models in scikit-learn", ['scikit-learn']),
+    ("Applied machine learning and ML-driven ranking", ['machine learning']),
+])
+def test_extract(text, expected):
+    assert SkillIndex.from_lines(SKILLS).extract(text) == expected
+
+
+def test_default_skills():
+    assert load_skill_index().extract("Python-based Django apps in React") == ['python', 'django', 'react']
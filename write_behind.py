@@ -0,0 +1,170 @@
+# Write-behind persistence
+# Analysis and feedback records are queued in-process and flushed by a background thread
+# with executemany, one transaction per batch, when the batch fills or the interval passes.
+# Hooks run inside the same transaction, so derived tables stay consistent with the rows. Each
+# hook runs under a savepoint: one that fails only loses its own derived rows (repairable with
+# analytics.py's backfill or a dashboard summary rebuild), never the rows themselves.
+
+import os
+import time
+import queue
+import atexit
+import threading
+import instrumentation
+
+
+class WriteBehindQueue:
+    def __init__(self, pool, batch_size=50, flush_interval=1.0, max_queue=1000, put_timeout=0.5, retries=2):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.retries = retries
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._hooks = []
+        self._listeners = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.stats = {'enqueued': 0, 'flushed': 0, 'rejected': 0, 'failed': 0, 'batches': 0, 'hook_errors': 0,
+                      'max_depth': 0, 'last_flush_seconds': 0.0, 'last_error': None}
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+
+    def add_hook(self, hook):
+        # hook(conn, table, rows) runs after the rows are inserted, before commit
+        self._hooks.append(hook)
+
+    def add_listener(self, listener):
+        # listener(tables) runs after a batch touching those tables has been committed
+        self._listeners.append(listener)
+
+    def submit(self, table, sql, params):
+        # Returns False when the queue stays full for put_timeout, so callers can shed load
+        try:
+            self._queue.put((table, sql, tuple(params)), timeout=self.put_timeout)
+        except queue.Full:
+            with self._lock:
+                self.stats['rejected'] += 1
+            return False
+        with self._lock:
+            self.stats['enqueued'] += 1
+            self.stats['max_depth'] = max(self.stats['max_depth'], self._queue.qsize())
+        return True
+
+    def write_now(self, table, sql, params):
+        # Synchronous path with the same hooks, for callers that can't wait for queue space
+        self._write([(table, sql, tuple(params))])
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def metrics(self):
+        with self._lock:
+            metrics = dict(self.stats)
+        metrics['depth'] = self.depth()
+        return metrics
+
+    def _collect(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        groups = {}
+        for table, sql, params in batch:
+            groups.setdefault((table, sql), []).append(params)
+
+        adapt = self.pool.backend.adapt
+        with instrumentation.stage('persist', rows=len(batch)), self.pool.connection() as conn:
+            cursor = conn.cursor()
+            for (table, sql), rows in groups.items():
+                cursor.executemany(adapt(sql), rows)
+                for hook in self._hooks:
+                    self._run_hook(conn, cursor, hook, table, rows)
+            conn.commit()
+        tables = {table for table, _ in groups}
+        for listener in self._listeners:
+            listener(tables)
+
+    def _run_hook(self, conn, cursor, hook, table, rows):
+        cursor.execute("SAVEPOINT write_hook")
+        try:
+            hook(conn, table, rows)
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT write_hook")
+            with self._lock:
+                self.stats['hook_errors'] += 1
+            instrumentation.count('resume_write_hook_errors_total', table=table)
+            print(f"Warning: {hook.__qualname__.split('.')[0]} failed for {len(rows)} {table} rows, "
+                  f"which are kept: {str(e)}")
+        else:
+            cursor.execute("RELEASE SAVEPOINT write_hook")
+
+    def _flush_batch(self, batch):
+        started = time.monotonic()
+        written = False
+        for attempt in range(self.retries + 1):
+            try:
+                self._write(batch)
+                written = True
+                break
+            except Exception as e:
+                with self._lock:
+                    self.stats['last_error'] = str(e)
+                if attempt < self.retries:
+                    time.sleep(0.2 * (attempt + 1))
+        if not written:
+            print(f"Warning: Dropping {len(batch)} queued database rows: {self.stats['last_error']}")
+        instrumentation.count('resume_rows_written_total' if written else 'resume_rows_dropped_total', len(batch))
+
+        with self._lock:
+            self.stats['flushed' if written else 'failed'] += len(batch)
+            self.stats['batches'] += 1
+            self.stats['last_flush_seconds'] = time.monotonic() - started
+        for _ in batch:
+            self._queue.task_done()
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._collect()
+            if batch:
+                self._flush_batch(batch)
+
+    def flush(self, timeout=None):
+        # Blocks until everything queued so far has been written (or dropped)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout=10):
+        self._stop.set()
+        self._thread.join(timeout)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer(pool):
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = WriteBehindQueue(pool,
+                                           batch_size=int(os.environ.get('RESUME_WRITE_BATCH', '50')),
+                                           flush_interval=float(os.environ.get('RESUME_WRITE_INTERVAL', '1.0')),
+                                           max_queue=int(os.environ.get('RESUME_WRITE_QUEUE', '1000')))
+                # Drain whatever is still queued when the server shuts down
+                atexit.register(_writer.close)
+    return _writer